@@ -1,15 +1,18 @@
 from __future__ import annotations
+import argparse
 import logging
-import sys
+import os
 
+from batch import parse_seed_range, run_batch
+from maze import stream_maze, tiled_maze
 from ui_ascii import print_maze
 from ui_mlx import interactive_display
 from utils import Color, Config, safe
 
 
-
 logger = logging.getLogger(__name__)
 
+
 @safe
 def main() -> None:
     logging.basicConfig(
@@ -17,8 +20,41 @@ def main() -> None:
         format="%(message)s",
     )
 
-    config_file = sys.argv[1] if len(sys.argv) > 1 else "utils/default.cfg"
-    cfg = Config.load(config_file)
+    parser = argparse.ArgumentParser(prog="a_maze_ing.py")
+    parser.add_argument("config", nargs="?", default="utils/default.cfg")
+    parser.add_argument(
+        "--batch", metavar="START-END",
+        help="generate one maze per seed in the range instead of the UI",
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--output", default="mazes",
+        help="batch output directory or .zip/.tar/.tar.gz archive",
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="write OUTPUT_FILE row by row with Eller's algorithm and exit",
+    )
+    parser.add_argument(
+        "--tiled", action="store_true",
+        help="generate OUTPUT_FILE tile by tile through a file and exit",
+    )
+    args = parser.parse_args()
+
+    cfg = Config.load(args.config)
+
+    if args.stream:
+        stream_maze(cfg, logger)
+        return
+
+    if args.tiled:
+        tiled_maze(cfg, logger)
+        return
+
+    if args.batch:
+        run_batch(cfg, parse_seed_range(args.batch), args.workers, args.output)
+        return
+
     colors = Color(cfg)
 
     logger.info(
@@ -26,10 +62,11 @@ def main() -> None:
         cfg.width, cfg.height, cfg.entry, cfg.exit, cfg.perfect, cfg.seed,
     )
 
-    if cfg.display == "ascii":
+    if cfg.display in ("ascii", "unicode"):
         print_maze(cfg, colors, logger)
     else:
         interactive_display(cfg, colors, logger)
 
+
 if __name__ == "__main__":
     main()
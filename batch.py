@@ -0,0 +1,139 @@
+from __future__ import annotations
+import io
+import logging
+import os
+import tarfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Iterable, Iterator, Literal
+
+from maze import maze_text
+from utils import Config, is_compressed, open_maze_file
+
+logger = logging.getLogger(__name__)
+
+# Set once per worker process by _init_worker, so tasks only carry a seed
+_worker_cfg: Config | None = None
+
+
+def parse_seed_range(value: str) -> range:
+    """Parse 'N' or 'START-END' (inclusive) into a range of seeds."""
+    try:
+        if "-" in value[1:]:
+            cut = value.index("-", 1)
+            first, last = int(value[:cut]), int(value[cut + 1:])
+        else:
+            first = last = int(value)
+    except ValueError:
+        raise ValueError(f"Invalid seed range {value!r} (expected START-END)")
+    if last < first:
+        raise ValueError(f"Empty seed range {value!r}")
+    return range(first, last + 1)
+
+
+def _init_worker(cfg: Config) -> None:
+    global _worker_cfg
+    _worker_cfg = cfg
+
+
+def _build(seed: int) -> tuple[int, str]:
+    assert _worker_cfg is not None
+    cfg = replace(_worker_cfg, seed=seed)
+    return seed, maze_text(cfg, logger)
+
+
+def generate_batch(
+    cfg: Config,
+    seeds: Iterable[int],
+    workers: int,
+) -> Iterator[tuple[int, str]]:
+    """
+    Yield (seed, maze file text) for every seed, in seed order.
+
+    Each maze depends only on cfg and its seed, so the output is the same
+    for any worker count.
+    """
+    seeds = list(seeds)
+    if workers <= 1:
+        _init_worker(cfg)
+        yield from map(_build, seeds)
+        return
+    chunksize = max(1, min(64, len(seeds) // (workers * 4)))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(cfg,),
+    ) as pool:
+        yield from pool.map(_build, seeds, chunksize=chunksize)
+
+
+def _member_name(cfg: Config, seed: int, archive: bool = False) -> str:
+    """
+    OUTPUT_FILE's name with the seed before its extension. Archive members
+    are stored as plain text (the archive compresses them), so they drop
+    a .gz/.xz/.lzma suffix; files in a directory keep it and are written
+    compressed.
+    """
+    name = os.path.basename(cfg.output_file)
+    suffix = ""
+    if is_compressed(name):
+        name, suffix = os.path.splitext(name)
+    stem, ext = os.path.splitext(name)
+    return f"{stem}_{seed}{ext or '.txt'}{'' if archive else suffix}"
+
+
+_TarMode = Literal["w", "w:gz", "w:xz"]
+
+
+def _tar_mode(output: str) -> _TarMode | None:
+    if output.endswith((".tar.gz", ".tgz")):
+        return "w:gz"
+    if output.endswith((".tar.xz", ".txz")):
+        return "w:xz"
+    if output.endswith(".tar"):
+        return "w"
+    return None
+
+
+def run_batch(
+    cfg: Config,
+    seeds: range,
+    workers: int,
+    output: str,
+) -> int:
+    """
+    Generate, solve and dump one maze per seed.
+
+    output is a directory, or a single .zip / .tar[.gz|.xz] archive.
+    Mazes are written as they finish, in seed order. Returns the count.
+    """
+    mazes = generate_batch(cfg, seeds, workers)
+    count = 0
+    tar_mode = _tar_mode(output)
+    if output.endswith(".zip"):
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zf:
+            for seed, text in mazes:
+                zf.writestr(_member_name(cfg, seed, archive=True), text)
+                count += 1
+    elif tar_mode is not None:
+        with tarfile.open(output, tar_mode) as tf:
+            for seed, text in mazes:
+                data = text.encode("utf-8")
+                info = tarfile.TarInfo(
+                    _member_name(cfg, seed, archive=True)
+                )
+                info.size = len(data)
+                tf.addfile(info, io.BytesIO(data))
+                count += 1
+    else:
+        os.makedirs(output, exist_ok=True)
+        for seed, text in mazes:
+            name = os.path.join(output, _member_name(cfg, seed))
+            with open_maze_file(
+                name, "wt", encoding="utf-8", newline="\n"
+            ) as f:
+                f.write(text)
+            count += 1
+    logger.info("%d mazes written to %s", count, output)
+    return count
@@ -0,0 +1,15 @@
+from .cases import CASES, Case, Fixture
+from .runner import DEFAULT_SIZES, Result, run_benchmarks
+from .report import compare, load_report, save_report
+
+__all__ = [
+    "CASES",
+    "Case",
+    "Fixture",
+    "DEFAULT_SIZES",
+    "Result",
+    "run_benchmarks",
+    "compare",
+    "load_report",
+    "save_report",
+]
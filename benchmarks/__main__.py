@@ -0,0 +1,121 @@
+"""
+Benchmark CLI.
+
+    python -m benchmarks run [--sizes 20x15,500x500] [--output FILE]
+                             [--baseline FILE]
+    python -m benchmarks compare BASELINE CURRENT
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+
+from utils import safe
+
+from .cases import CASES
+from .report import compare, load_report, save_report
+from .runner import DEFAULT_SIZES, Result, run_benchmarks
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_sizes(value: str) -> list[tuple[int, int]]:
+    sizes: list[tuple[int, int]] = []
+    for item in value.split(","):
+        try:
+            w, h = item.lower().split("x")
+            sizes.append((int(w), int(h)))
+        except ValueError:
+            raise argparse.ArgumentTypeError(
+                f"Invalid size {item!r} (expected WIDTHxHEIGHT)"
+            )
+    return sizes
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="run the benchmark ladder")
+    run.add_argument(
+        "--sizes", type=_parse_sizes, default=DEFAULT_SIZES,
+        help="comma separated WIDTHxHEIGHT list (default: 20x15..4000x4000)",
+    )
+    run.add_argument(
+        "--max-cells", type=int, default=None,
+        help="drop sizes with more cells than this",
+    )
+    run.add_argument(
+        "--cases", default=None,
+        help="comma separated case names (default: all)",
+    )
+    run.add_argument("--repeat", type=int, default=1)
+    run.add_argument(
+        "--no-memory", action="store_true",
+        help="skip the tracemalloc peak-memory pass",
+    )
+    run.add_argument("--output", default="bench_results.json")
+    run.add_argument(
+        "--baseline", default=None,
+        help="compare against this report after running",
+    )
+    run.add_argument("--threshold", type=float, default=0.10)
+
+    cmp = sub.add_parser("compare", help="compare two saved reports")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.10)
+    return parser
+
+
+def _report_regressions(
+    baseline: list[Result],
+    current: list[Result],
+    threshold: float,
+) -> int:
+    regressions = compare(baseline, current, threshold, threshold)
+    if not regressions:
+        logger.info("No regressions (threshold %.0f%%)", threshold * 100)
+        return 0
+    logger.info("%d regression(s):", len(regressions))
+    for regression in regressions:
+        logger.info("  %s", regression)
+    return 1
+
+
+@safe
+def main(argv: list[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = _parser().parse_args(argv)
+
+    if args.command == "compare":
+        return _report_regressions(
+            load_report(args.baseline),
+            load_report(args.current),
+            args.threshold,
+        )
+
+    sizes = args.sizes
+    if args.max_cells is not None:
+        sizes = [(w, h) for w, h in sizes if w * h <= args.max_cells]
+    cases = CASES
+    if args.cases:
+        wanted = set(args.cases.split(","))
+        unknown = wanted - {c.name for c in CASES}
+        if unknown:
+            raise ValueError(f"Unknown case(s): {', '.join(sorted(unknown))}")
+        cases = [c for c in CASES if c.name in wanted]
+
+    results = run_benchmarks(sizes, cases, args.repeat, not args.no_memory)
+    save_report(results, args.output)
+    logger.info("Results written to %s", args.output)
+    if args.baseline:
+        return _report_regressions(
+            load_report(args.baseline), results, args.threshold
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import Callable
+
+from generator import ALGORITHM_VERSIONS, ALGORITHMS, generate_maze
+from hierarchy import HierarchyIndex
+from incremental import IncrementalSolver
+from solution import (
+    SOLVERS,
+    JunctionGraph,
+    clear_distance_cache,
+    solve,
+    solve_many,
+)
+from tree_index import TreeIndex
+from ui_ascii import render_maze_ascii
+from ui_mlx import CELL, UI_H, draw_maze, path_cells_from_path
+from utils import (
+    Color,
+    Config,
+    Direction,
+    Drawer,
+    Maze,
+    dump_maze,
+    dump_packed,
+    load_maze,
+    load_packed,
+)
+
+# Skip limits for cases whose output grows much faster than the grid
+ASCII_MAX_CELLS = 1_000_000
+MLX_MAX_PIXELS = 16_000_000
+HPA_MAX_CELLS = 1_000_000
+# Generators too slow to run on the whole default ladder
+GENERATE_MAX_CELLS = {"wilson": 250 * 250}
+
+SEED = 42
+
+
+@dataclass
+class Fixture:
+    """Maze shared by every case of one size, built outside the timers"""
+    width: int
+    height: int
+    workdir: str
+    maze: Maze = field(init=False)
+    path: list[Direction] = field(init=False)
+    cfg: Config = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.cfg = Config(
+            width=self.width,
+            height=self.height,
+            entry=(0, 0),
+            exit=(self.width - 1, self.height - 1),
+            perfect=True,
+            show_path=True,
+            seed=SEED,
+        )
+        self.maze = generate_maze(
+            self.width, self.height, self.cfg.entry, self.cfg.exit,
+            perfect=True, seed=SEED,
+        )
+        self.path = solve(self.maze, self.cfg.entry, self.cfg.exit) or []
+
+    @property
+    def maze_file(self) -> str:
+        return os.path.join(
+            self.workdir, f"maze_{self.width}x{self.height}.txt"
+        )
+
+    @property
+    def packed_file(self) -> str:
+        return os.path.join(
+            self.workdir, f"maze_{self.width}x{self.height}.amz"
+        )
+
+
+@dataclass
+class Case:
+    """
+    One benchmark.
+
+    prepare() does the untimed setup and returns the callable to measure.
+    skip() returns a reason string when the case does not fit the size.
+    """
+    name: str
+    prepare: Callable[[Fixture], Callable[[], object]]
+    skip: Callable[[Fixture], str | None] = lambda fx: None
+
+
+def _generate(
+    perfect: bool,
+    algorithm: str = "backtracking",
+    version: int = 1,
+) -> Callable[[Fixture], Callable[[], object]]:
+    def prepare(fx: Fixture) -> Callable[[], object]:
+        cfg = fx.cfg
+        return lambda: generate_maze(
+            cfg.width, cfg.height, cfg.entry, cfg.exit,
+            perfect=perfect, seed=SEED, algorithm=algorithm,
+            version=version,
+        )
+    return prepare
+
+
+def _skip_generate(algorithm: str) -> Callable[[Fixture], str | None]:
+    def skip(fx: Fixture) -> str | None:
+        limit = GENERATE_MAX_CELLS.get(algorithm)
+        if limit is not None and fx.width * fx.height > limit:
+            return f"{algorithm} too slow above {limit} cells"
+        return None
+    return skip
+
+
+def _solve(solver: str) -> Callable[[Fixture], Callable[[], object]]:
+    def prepare(fx: Fixture) -> Callable[[], object]:
+        return lambda: solve(fx.maze, fx.cfg.entry, fx.cfg.exit, solver)
+    return prepare
+
+
+def _solve_junctions(fx: Fixture) -> Callable[[], object]:
+    # A fresh graph every repeat, so the build is timed and not the cache
+    return lambda: JunctionGraph(fx.maze).path(fx.cfg.entry, fx.cfg.exit)
+
+
+def _solve_many(fx: Fixture) -> Callable[[], object]:
+    # 16 targets spread over the grid, answered from one cold traversal
+    w, h = fx.width, fx.height
+    targets = [
+        (w * i // 4, h * j // 4) for i in range(4) for j in range(4)
+    ]
+
+    def run() -> None:
+        clear_distance_cache()
+        paths = solve_many(fx.maze, fx.cfg.entry, targets)
+        for target in paths:
+            paths[target]
+    return run
+
+
+def _tree_queries(fx: Fixture) -> Callable[[], object]:
+    # Index build plus 1000 path lengths between far apart cells
+    w, h = fx.width, fx.height
+    pairs = [
+        ((i * 7919) % w, (i * 104729) % h) for i in range(2000)
+    ]
+
+    def run() -> None:
+        index = TreeIndex(fx.maze)
+        for a, b in zip(pairs[::2], pairs[1::2]):
+            index.distance(a, b)
+    return run
+
+
+def _solve_hierarchical(fx: Fixture) -> Callable[[], object]:
+    index = HierarchyIndex.build(fx.maze)
+    return lambda: index.path(fx.maze, fx.cfg.entry, fx.cfg.exit)
+
+
+def _skip_hierarchical(fx: Fixture) -> str | None:
+    if fx.width * fx.height > HPA_MAX_CELLS:
+        return f"index build too slow above {HPA_MAX_CELLS} cells"
+    return None
+
+
+def _wall_edits(fx: Fixture) -> Callable[[], object]:
+    # 100 wall toggles, each followed by a re-solve, on a private copy
+    maze = fx.maze.copy()
+    solver = IncrementalSolver(maze, fx.cfg.entry)
+    w, h = fx.width, fx.height
+    edits = [
+        ((i * 7919) % w, (i * 104729) % h, list(Direction)[i % 4])
+        for i in range(100)
+    ]
+
+    def run() -> None:
+        for x, y, d in edits:
+            if maze.cells[y * w + x] & d:
+                solver.open_wall(x, y, d)
+            else:
+                solver.close_wall(x, y, d)
+            solver.path(fx.cfg.exit)
+    return run
+
+
+def _dump(fx: Fixture) -> Callable[[], object]:
+    return lambda: dump_maze(
+        fx.maze, fx.cfg.entry, fx.cfg.exit, fx.path, fx.maze_file
+    )
+
+
+def _load(fx: Fixture) -> Callable[[], object]:
+    if not os.path.exists(fx.maze_file):
+        dump_maze(fx.maze, fx.cfg.entry, fx.cfg.exit, fx.path, fx.maze_file)
+    return lambda: load_maze(fx.maze_file)
+
+
+def _dump_packed(fx: Fixture) -> Callable[[], object]:
+    return lambda: dump_packed(
+        fx.maze, fx.cfg.entry, fx.cfg.exit, fx.path, fx.packed_file
+    )
+
+
+def _load_packed(fx: Fixture) -> Callable[[], object]:
+    if not os.path.exists(fx.packed_file):
+        dump_packed(
+            fx.maze, fx.cfg.entry, fx.cfg.exit, fx.path, fx.packed_file
+        )
+
+    def run() -> None:
+        with load_packed(fx.packed_file) as packed:
+            packed.to_maze()
+            packed.path()
+    return run
+
+
+def _render_ascii(fx: Fixture) -> Callable[[], object]:
+    colors = Color(fx.cfg)
+    return lambda: render_maze_ascii(
+        fx.maze, colors, fx.cfg.entry, fx.cfg.exit, fx.path
+    )
+
+
+def _skip_ascii(fx: Fixture) -> str | None:
+    if fx.width * fx.height > ASCII_MAX_CELLS:
+        return f"more than {ASCII_MAX_CELLS} cells"
+    return None
+
+
+def _window_size(fx: Fixture) -> tuple[int, int]:
+    return fx.width * CELL + 1, fx.height * CELL + UI_H + 1
+
+
+def _render_mlx(fx: Fixture) -> Callable[[], object]:
+    win_w, win_h = _window_size(fx)
+    buf = memoryview(bytearray(win_w * win_h * 4))
+    drawer = Drawer(buf, win_w * 4)
+    colors = Color(fx.cfg)
+    path_cells = path_cells_from_path(fx.cfg.entry, fx.path)
+
+    def run() -> None:
+        drawer.fill_rect(0, 0, win_w, win_h, fill_color=colors.bg)
+        draw_maze(
+            drawer, fx.maze, colors, fx.cfg.entry, fx.cfg.exit,
+            path_cells, True,
+        )
+    return run
+
+
+def _skip_mlx(fx: Fixture) -> str | None:
+    win_w, win_h = _window_size(fx)
+    if win_w * win_h > MLX_MAX_PIXELS:
+        return f"window larger than {MLX_MAX_PIXELS} pixels"
+    return None
+
+
+CASES: list[Case] = [
+    Case("generate_perfect", _generate(True)),
+    Case("generate_imperfect", _generate(False)),
+    *(
+        Case(f"generate_{name}", _generate(True, name),
+             _skip_generate(name))
+        for name in ALGORITHMS if name != "backtracking"
+    ),
+    *(
+        Case(f"generate_{name}_v{version}", _generate(True, name, version))
+        for name, version in ALGORITHM_VERSIONS
+    ),
+    Case("solve", _solve("bfs")),
+    *(
+        Case(f"solve_{name}", _solve(name))
+        for name in SOLVERS if name not in ("bfs", "junctions")
+    ),
+    Case("solve_junctions", _solve_junctions),
+    Case("solve_hierarchical", _solve_hierarchical, _skip_hierarchical),
+    Case("solve_many", _solve_many),
+    Case("wall_edits", _wall_edits),
+    Case("tree_queries", _tree_queries),
+    Case("dump_maze", _dump),
+    Case("load_maze", _load),
+    Case("dump_packed", _dump_packed),
+    Case("load_packed", _load_packed),
+    Case("render_ascii", _render_ascii, _skip_ascii),
+    Case("render_mlx", _render_mlx, _skip_mlx),
+]
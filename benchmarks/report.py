@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import platform
+import sys
+import time
+from dataclasses import dataclass
+
+from .runner import Result
+
+FORMAT_VERSION = 1
+
+# Timings below this are dominated by noise and never flagged
+MIN_SECONDS = 0.005
+
+
+@dataclass
+class Regression:
+    case: str
+    width: int
+    height: int
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+    def __str__(self) -> str:
+        return (
+            f"{self.case} {self.width}x{self.height}: {self.metric} "
+            f"{self.baseline:.4g} -> {self.current:.4g} "
+            f"(x{self.ratio:.2f})"
+        )
+
+
+def save_report(results: list[Result], filename: str) -> None:
+    report = {
+        "version": FORMAT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": [r.to_dict() for r in results],
+    }
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+
+def load_report(filename: str) -> list[Result]:
+    with open(filename, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    if report.get("version") != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported benchmark report version in {filename}"
+        )
+    return [Result.from_dict(r) for r in report["results"]]
+
+
+def compare(
+    baseline: list[Result],
+    current: list[Result],
+    threshold: float = 0.10,
+    memory_threshold: float = 0.10,
+) -> list[Regression]:
+    """
+    Return every case/size measured in both runs that got slower (or
+    used more peak memory) by more than the given relative threshold.
+    """
+    base = {(r.case, r.width, r.height): r for r in baseline}
+    regressions: list[Regression] = []
+    for cur in current:
+        old = base.get((cur.case, cur.width, cur.height))
+        if old is None or old.skipped or cur.skipped:
+            continue
+        if old.seconds is not None and cur.seconds is not None and \
+                max(old.seconds, cur.seconds) >= MIN_SECONDS and \
+                cur.seconds > old.seconds * (1 + threshold):
+            regressions.append(Regression(
+                cur.case, cur.width, cur.height,
+                "seconds", old.seconds, cur.seconds,
+            ))
+        if old.peak_bytes is not None and cur.peak_bytes is not None and \
+                cur.peak_bytes > old.peak_bytes * (1 + memory_threshold):
+            regressions.append(Regression(
+                cur.case, cur.width, cur.height,
+                "peak_bytes", old.peak_bytes, cur.peak_bytes,
+            ))
+    return regressions
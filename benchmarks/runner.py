@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import gc
+import logging
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from .cases import CASES, Case, Fixture
+
+DEFAULT_SIZES: list[tuple[int, int]] = [
+    (20, 15),
+    (100, 75),
+    (250, 250),
+    (500, 500),
+    (1000, 1000),
+    (2000, 2000),
+    (4000, 4000),
+]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Result:
+    case: str
+    width: int
+    height: int
+    seconds: float | None = None
+    peak_bytes: int | None = None
+    skipped: str | None = None
+
+    @property
+    def cells(self) -> int:
+        return self.width * self.height
+
+    @property
+    def cells_per_sec(self) -> float | None:
+        if not self.seconds:
+            return None
+        return self.cells / self.seconds
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "case": self.case,
+            "width": self.width,
+            "height": self.height,
+            "cells": self.cells,
+            "seconds": self.seconds,
+            "peak_bytes": self.peak_bytes,
+            "cells_per_sec": self.cells_per_sec,
+            "skipped": self.skipped,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, object]) -> Result:
+        return cls(
+            case=str(data["case"]),
+            width=int(data["width"]),  # type: ignore[call-overload]
+            height=int(data["height"]),  # type: ignore[call-overload]
+            seconds=data.get("seconds"),  # type: ignore[arg-type]
+            peak_bytes=data.get("peak_bytes"),  # type: ignore[arg-type]
+            skipped=data.get("skipped"),  # type: ignore[arg-type]
+        )
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _peak_memory(fn: Callable[[], object]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_benchmarks(
+    sizes: Iterable[tuple[int, int]] = DEFAULT_SIZES,
+    cases: Iterable[Case] = CASES,
+    repeat: int = 1,
+    memory: bool = True,
+) -> list[Result]:
+    """
+    Run every case on every size.
+
+    Wall time is the best of `repeat` plain runs; peak memory comes from
+    one extra run under tracemalloc so it does not skew the timings.
+    """
+    selected = list(cases)
+    results: list[Result] = []
+    with tempfile.TemporaryDirectory(prefix="amazeing-bench-") as workdir:
+        for width, height in sizes:
+            logger.info("== %dx%d ==", width, height)
+            fixture = Fixture(width, height, workdir)
+            for case in selected:
+                result = Result(case.name, width, height)
+                result.skipped = case.skip(fixture)
+                if result.skipped is None:
+                    fn = case.prepare(fixture)
+                    result.seconds = _time(fn, repeat)
+                    if memory:
+                        result.peak_bytes = _peak_memory(fn)
+                _log_result(result)
+                results.append(result)
+            del fixture
+    return results
+
+
+def _log_result(result: Result) -> None:
+    if result.skipped is not None:
+        logger.info("  %-20s skipped (%s)", result.case, result.skipped)
+        return
+    peak = result.peak_bytes
+    logger.info(
+        "  %-24s %10.4fs %14s cells/s %12s peak",
+        result.case,
+        result.seconds,
+        f"{result.cells_per_sec:,.0f}" if result.cells_per_sec else "-",
+        f"{peak / 1024 / 1024:,.1f}MiB" if peak is not None else "-",
+    )
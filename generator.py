@@ -1,5 +1,9 @@
-from utils import Maze, Direction, Point, CLOSED_CELL
+from utils import Maze, Direction, Point, CLOSED_CELL, ROOT
+from typing import Callable, Iterator
+import itertools
 import random
+from array import array
+import generator_numpy
 
 # "42" pattern
 _DIGIT_4: list[list[int]] = [
@@ -70,63 +74,98 @@ def _find_42_position(
     return -1, -1
 
 
-def _remove_wall(maze: Maze, x: int, y: int, d: Direction) -> None:
-    maze[y][x] &= ~d
-    dx, dy = d.delta
-    nx, ny = x + dx, y + dy
-    w, h = len(maze[0]), len(maze)
-    if 0 <= nx < w and 0 <= ny < h:
-        maze[ny][nx] &= ~d.opposite
+_EAST = int(Direction.EAST)
+_SOUTH = int(Direction.SOUTH)
+# byte -> 1 if that wall is open, for bytes.translate over a whole row
+_EAST_OPEN = bytes(0 if c & _EAST else 1 for c in range(256))
+_SOUTH_OPEN = bytes(0 if c & _SOUTH else 1 for c in range(256))
 
 
-def _would_create_3x3_open(maze: Maze, x: int, y: int, d: Direction) -> bool:
-    width, height = len(maze[0]), len(maze)
-    dx, dy = d.delta
-    nx, ny = x + dx, y + dy
-    for ay in range(
-        max(0, max(y, ny) - 2), min(height - 2, min(y, ny)) + 1
-    ):
-        for ax in range(
-            max(0, max(x, nx) - 2), min(width - 2, min(x, nx)) + 1
-        ):
-            if _is_open_3x3(maze, ax, ay, skip_edge=(x, y, d)):
-                return True
-    return False
+class _OpenWindows:
+    """
+    Number of open internal edges in every 3x3 window of the grid.
 
+    A window has 12 internal edges and is fully open at 12, so opening one
+    more edge creates a 3x3 open area exactly when some window containing
+    it is at 11. _remove_wall keeps the counts in sync.
+    """
 
-def _is_open_3x3(
-    maze: Maze,
-    ax: int,
-    ay: int,
-    skip_edge: tuple[int, int, Direction] | None = None,
-) -> bool:
-    for dy in range(3):
-        for dx in range(3):
-            cx, cy = ax + dx, ay + dy
-            if dx < 2:
-                if not _pair_open(maze, cx, cy, Direction.EAST, skip_edge):
-                    return False
-            if dy < 2:
-                if not _pair_open(maze, cx, cy, Direction.SOUTH, skip_edge):
-                    return False
-    return True
+    __slots__ = ("cols", "rows", "counts")
+
+    def __init__(self, maze: Maze) -> None:
+        width, height = maze.width, maze.height
+        cols = self.cols = max(0, width - 2)
+        rows = self.rows = max(0, height - 2)
+        self.counts = bytearray()
+        if not cols or not rows:
+            return
+        cells = maze.cells
+        # per row: open EAST edges of a window's 2 column pairs and open
+        # SOUTH edges of its 3 columns, summed over rows of the window
+        east: list[list[int]] = []
+        south: list[list[int]] = []
+        for y in range(height):
+            row = cells[y * width:(y + 1) * width]
+            e = row.translate(_EAST_OPEN)
+            s = row.translate(_SOUTH_OPEN)
+            east.append([a + b for a, b in zip(e[:cols], e[1:cols + 1])])
+            south.append([a + b + c for a, b, c in zip(s, s[1:], s[2:])])
+            if len(east) < 3:
+                continue
+            self.counts.extend(
+                e0 + e1 + e2 + s0 + s1
+                for e0, e1, e2, s0, s1 in zip(
+                    east[0], east[1], east[2], south[0], south[1]
+                )
+            )
+            del east[0], south[0]
+
+    def _windows(self, x: int, y: int, d: int) -> list[int]:
+        # normalize to the EAST/SOUTH edge of the upper-left cell
+        if d == Direction.WEST:
+            x, d = x - 1, _EAST
+        elif d == Direction.NORTH:
+            y, d = y - 1, _SOUTH
+        if d == _EAST:
+            x0, y0 = x - 1, y - 2
+        else:
+            x0, y0 = x - 2, y - 1
+        cols = self.cols
+        return [
+            ay * cols + ax
+            for ay in range(max(0, y0), min(self.rows - 1, y) + 1)
+            for ax in range(max(0, x0), min(cols - 1, x) + 1)
+        ]
 
+    def open(self, x: int, y: int, d: int) -> None:
+        counts = self.counts
+        for i in self._windows(x, y, d):
+            counts[i] += 1
 
-def _pair_open(
+    def would_fill(self, x: int, y: int, d: int) -> bool:
+        counts = self.counts
+        for i in self._windows(x, y, d):
+            if counts[i] == 11:
+                return True
+        return False
+
+
+def _remove_wall(
     maze: Maze,
     x: int,
     y: int,
     d: Direction,
-    skip_edge: tuple[int, int, Direction] | None,
-) -> bool:
-    if skip_edge is not None:
-        sx, sy, sd = skip_edge
-        ddx, ddy = d.delta
-        if (x == sx and y == sy and d == sd):
-            return True
-        if (x + ddx == sx and y + ddy == sy and d.opposite == sd):
-            return True
-    return not (maze[y][x] & d)
+    windows: _OpenWindows | None = None,
+) -> None:
+    w, h = maze.width, maze.height
+    bit = int(d)
+    if windows is not None and maze.cells[y * w + x] & bit:
+        windows.open(x, y, bit)
+    maze.cells[y * w + x] &= ~bit
+    dx, dy = d.delta
+    nx, ny = x + dx, y + dy
+    if 0 <= nx < w and 0 <= ny < h:
+        maze.cells[ny * w + nx] &= ~int(d.opposite)
 
 
 def generate_maze(
@@ -136,36 +175,138 @@ def generate_maze(
     exit_: Point,
     perfect: bool = True,
     seed: int | None = None,
+    algorithm: str = "backtracking",
+    engine: str = "python",
+    version: int = 1,
 ) -> Maze:
+    return generate_maze_tree(
+        width, height, entry, exit_, perfect, seed, algorithm, engine,
+        version,
+    )[0]
+
+
+def generate_maze_tree(
+    width: int,
+    height: int,
+    entry: Point,
+    exit_: Point,
+    perfect: bool = True,
+    seed: int | None = None,
+    algorithm: str = "backtracking",
+    engine: str = "python",
+    version: int = 1,
+) -> tuple[Maze, bytearray | None]:
+    """
+    Same maze as generate_maze, plus the spanning tree it was carved as.
+
+    The tree is one byte per cell holding the Direction bit of the step
+    from the cell's parent into it (ROOT at entry, 0 for cells outside),
+    so solution.path_from_parents can read a path off it. It is None for
+    non-perfect mazes and for algorithms that do not grow from entry.
+    version selects the generator under the seed contract (see
+    ALGORITHM_VERSIONS); 1 is the original one.
+    """
     _validate_points(width, height, entry, exit_)
+    carve = get_carver(algorithm, version)
+    use_numpy = _use_numpy(algorithm, engine)
     rng = random.Random(seed)
-    maze: Maze = [[int(CLOSED_CELL)] * width for _ in range(height)]
-    ox, oy = _find_42_position(width, height, entry, exit_, rng)
-    if ox > -1 and oy > -1:
-        pattern_cells = _pattern_42_cells(ox, oy)
+    maze = Maze(width, height, fill=int(CLOSED_CELL))
+    pattern_cells = _place_42(width, height, entry, exit_, rng)
+    parents: bytearray | None = None
+    if use_numpy:
+        roots = generator_numpy.ALGORITHMS[algorithm](
+            maze, pattern_cells, rng
+        )
+        states = _cell_states(width, height, pattern_cells)
+        _join_forest(maze, states, roots, rng)
     else:
-        pattern_cells = []
-    _backtracking(maze, width, height, entry, pattern_cells, rng)
+        parents = carve(maze, width, height, entry, pattern_cells, rng)
     if not perfect:
         _add_extra_passages(maze, width, height, pattern_cells, rng)
+        parents = None
+    if use_numpy:
+        grid = generator_numpy.grid_view(maze)
+        generator_numpy.enforce_borders(grid)
+        generator_numpy.stamp_pattern(grid, pattern_cells)
+        return maze, parents
     _enforce_borders(maze, width, height)
+    cells = maze.cells
     for px, py in pattern_cells:
-        maze[py][px] = int(CLOSED_CELL)
+        cells[py * width + px] = int(CLOSED_CELL)
         for d in Direction:
             ddx, ddy = d.delta
             nnx, nny = px + ddx, py + ddy
             if 0 <= nnx < width and 0 <= nny < height:
-                maze[nny][nnx] |= d.opposite
-    return maze
+                cells[nny * width + nnx] |= d.opposite
+    return maze, parents
+
+
+def _use_numpy(algorithm: str, engine: str) -> bool:
+    """
+    ENGINE=python (the default) keeps a SEED's maze the same whether or
+    not NumPy is installed. ENGINE=auto opts in to the NumPy engine when
+    it is installed and has the algorithm; a SEED is then reproducible
+    per engine, not across them.
+    """
+    if engine == "python":
+        return False
+    if engine == "auto":
+        return generator_numpy.AVAILABLE and \
+            algorithm in generator_numpy.ALGORITHMS
+    if engine != "numpy":
+        raise ValueError(
+            f"Unknown ENGINE {engine!r} (expected auto, python or numpy)"
+        )
+    if not generator_numpy.AVAILABLE:
+        raise ValueError("ENGINE=numpy needs NumPy to be installed")
+    if algorithm not in generator_numpy.ALGORITHMS:
+        raise ValueError(
+            f"ENGINE=numpy does not support ALGORITHM={algorithm} "
+            f"(only {', '.join(generator_numpy.ALGORITHMS)})"
+        )
+    return True
+
+
+def generate_rows(
+    width: int,
+    height: int,
+    entry: Point,
+    exit_: Point,
+    seed: int | None = None,
+) -> Iterator[bytearray]:
+    """
+    Stream a perfect maze one finished row at a time with Eller's
+    algorithm, in O(width) memory.
+
+    Rows are identical to generate_maze(..., algorithm="eller") with the
+    same seed: borders closed and the "42" cells blocked.
+    """
+    _validate_points(width, height, entry, exit_)
+    rng = random.Random(seed)
+    pattern_cells = _place_42(width, height, entry, exit_, rng)
+    yield from _eller_rows(width, height, pattern_cells, rng)
+
+
+def _place_42(
+    width: int,
+    height: int,
+    entry: Point,
+    exit_: Point,
+    rng: random.Random,
+) -> set[Point]:
+    ox, oy = _find_42_position(width, height, entry, exit_, rng)
+    if ox > -1 and oy > -1:
+        return _pattern_42_cells(ox, oy)
+    return set()
 
 
 def get_pattern_cells(maze: Maze) -> set[Point]:
-    width, height = len(maze[0]), len(maze)
+    width = maze.width
+    closed = int(CLOSED_CELL)
     return {
-        (x, y)
-        for y in range(height)
-        for x in range(width)
-        if maze[y][x] == int(CLOSED_CELL)
+        (i % width, i // width)
+        for i, cell in enumerate(maze.cells)
+        if cell == closed
     }
 
 
@@ -189,28 +330,523 @@ def _backtracking(
     start: Point,
     blocked: set[Point],
     rng: random.Random,
-) -> None:
-    visited: set[Point] = set(blocked)
-    visited.add(start)
-    stack: list[Point] = [start]
+) -> bytearray:
+    # Visited cells as one byte each and the DFS stack as 4-byte linear
+    # indices: no tuple per cell, so a 4000x4000 grid stays within
+    # tens of MB
+    visited = _cell_states(width, height, blocked)
+    i = start[1] * width + start[0]
+    visited[i] = _IN_MAZE
+    stack = array("I", [i])
     directions = list(Direction)
+    deltas = {d: d.delta for d in Direction}
+    parents = bytearray(width * height)
+    parents[i] = ROOT
     while stack:
-        x, y = stack[-1]
+        i = stack[-1]
+        y, x = divmod(i, width)
         rng.shuffle(directions)
-        carved = False
         for d in directions:
-            ddx, ddy = d.delta
+            ddx, ddy = deltas[d]
             nx, ny = x + ddx, y + ddy
-            if nx < 0 or nx >= width or ny < 0 or \
-                    ny >= height or (nx, ny) in visited:
+            if nx < 0 or nx >= width or ny < 0 or ny >= height:
+                continue
+            j = ny * width + nx
+            if visited[j]:
                 continue
             _remove_wall(maze, x, y, d)
-            visited.add((nx, ny))
-            stack.append((nx, ny))
-            carved = True
+            parents[j] = d
+            visited[j] = _IN_MAZE
+            stack.append(j)
             break
-        if not carved:
+        else:
+            stack.pop()
+    return parents
+
+
+# Version 2 of the backtracker: every direction order, and a byte ->
+# order index table for drawing orders in bulk. Bytes 240-255 are
+# dropped so each of the 24 orders is equally likely.
+_ORDERS = tuple(itertools.permutations(Direction))
+_ORDER_OF_BYTE = bytes(b % len(_ORDERS) for b in range(256))
+_UNEVEN_BYTES = bytes(range(256 - 256 % len(_ORDERS), 256))
+_ORDER_BATCH = 1 << 14
+
+
+def _backtracking_batched(
+    maze: Maze,
+    width: int,
+    height: int,
+    start: Point,
+    blocked: set[Point],
+    rng: random.Random,
+) -> bytearray:
+    """
+    The recursive backtracker with its randomness drawn in bulk: one
+    randbytes call yields the direction orders for thousands of steps.
+    The grid is visited through a copy with a one-cell border marked as
+    visited, so neighbours need no bounds checks.
+    """
+    pw = width + 2
+    visited = bytearray([1]) * (pw * (height + 2))
+    for y in range(height):
+        visited[(y + 1) * pw + 1:(y + 1) * pw + 1 + width] = bytes(width)
+    for bx, by in blocked:
+        visited[(by + 1) * pw + bx + 1] = 1
+    # per order: (bit, opposite bit, padded step, grid step)
+    moves = [
+        tuple(
+            (int(d), int(d.opposite), d.delta[1] * pw + d.delta[0],
+             d.delta[1] * width + d.delta[0])
+            for d in order
+        )
+        for order in _ORDERS
+    ]
+    cells = maze.cells
+    parents = bytearray(width * height)
+    sx, sy = start
+    parents[sy * width + sx] = ROOT
+    p = (sy + 1) * pw + sx + 1
+    visited[p] = 1
+    stack = array("I", [p])
+    picks = b""
+    k = 0
+    while stack:
+        p = stack[-1]
+        if k == len(picks):
+            picks = rng.randbytes(_ORDER_BATCH).translate(
+                _ORDER_OF_BYTE, _UNEVEN_BYTES
+            )
+            k = 0
+        order = moves[picks[k]]
+        k += 1
+        for bit, back, step, grid_step in order:
+            q = p + step
+            if not visited[q]:
+                visited[q] = 1
+                i = p - pw - 1 - 2 * (p // pw - 1)
+                cells[i] &= ~bit
+                cells[i + grid_step] &= ~back
+                parents[i + grid_step] = bit
+                stack.append(q)
+                break
+        else:
             stack.pop()
+    return parents
+
+
+# Cell states shared by the linear-index generators below
+_FREE = 0
+_BLOCKED = 1
+_IN_MAZE = 2
+_FRONTIER = 3
+
+# Chance that growing-tree picks the newest active cell instead of a
+# random one: 1.0 behaves like backtracking, 0.0 like Prim
+_GROWING_TREE_NEWEST = 0.5
+
+
+def _cell_states(width: int, height: int, blocked: set[Point]) -> bytearray:
+    states = bytearray(width * height)
+    for bx, by in blocked:
+        states[by * width + bx] = _BLOCKED
+    return states
+
+
+def _neighbors(i: int, width: int, height: int) -> list[tuple[int, Direction]]:
+    """In-bounds neighbours of linear cell i as (index, direction to it)"""
+    x, y = i % width, i // width
+    result: list[tuple[int, Direction]] = []
+    if y > 0:
+        result.append((i - width, Direction.NORTH))
+    if x + 1 < width:
+        result.append((i + 1, Direction.EAST))
+    if y + 1 < height:
+        result.append((i + width, Direction.SOUTH))
+    if x > 0:
+        result.append((i - 1, Direction.WEST))
+    return result
+
+
+def _carve(maze: Maze, i: int, d: Direction) -> None:
+    _remove_wall(maze, i % maze.width, i // maze.width, d)
+
+
+def _kruskal(
+    maze: Maze,
+    width: int,
+    height: int,
+    start: Point,
+    blocked: set[Point],
+    rng: random.Random,
+) -> None:
+    """Randomized Kruskal: join shuffled walls with a union-find forest"""
+    states = _cell_states(width, height, blocked)
+    # edge = cell * 2 (+1 for SOUTH, +0 for EAST)
+    edges: list[int] = []
+    for i in range(width * height):
+        if states[i]:
+            continue
+        if (i + 1) % width and not states[i + 1]:
+            edges.append(i * 2)
+        if i + width < width * height and not states[i + width]:
+            edges.append(i * 2 + 1)
+    rng.shuffle(edges)
+    parent = list(range(width * height))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for edge in edges:
+        i = edge >> 1
+        if edge & 1:
+            j, d = i + width, Direction.SOUTH
+        else:
+            j, d = i + 1, Direction.EAST
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[ri] = rj
+            _carve(maze, i, d)
+
+
+def _prim(
+    maze: Maze,
+    width: int,
+    height: int,
+    start: Point,
+    blocked: set[Point],
+    rng: random.Random,
+) -> bytearray:
+    """Randomized Prim: attach a random frontier cell to the maze"""
+    states = _cell_states(width, height, blocked)
+    parents = bytearray(width * height)
+    frontier: list[int] = []
+
+    def add(i: int) -> None:
+        states[i] = _IN_MAZE
+        for j, _ in _neighbors(i, width, height):
+            if states[j] == _FREE:
+                states[j] = _FRONTIER
+                frontier.append(j)
+
+    parents[start[1] * width + start[0]] = ROOT
+    add(start[1] * width + start[0])
+    while frontier:
+        k = rng.randrange(len(frontier))
+        i = frontier[k]
+        frontier[k] = frontier[-1]
+        frontier.pop()
+        links = [
+            d for j, d in _neighbors(i, width, height)
+            if states[j] == _IN_MAZE
+        ]
+        d = rng.choice(links)
+        _carve(maze, i, d)
+        parents[i] = d.opposite
+        add(i)
+    return parents
+
+
+def _wilson(
+    maze: Maze,
+    width: int,
+    height: int,
+    start: Point,
+    blocked: set[Point],
+    rng: random.Random,
+) -> None:
+    """Wilson: add loop-erased random walks until every cell is in the tree"""
+    states = _cell_states(width, height, blocked)
+    states[start[1] * width + start[0]] = _IN_MAZE
+    for first in range(width * height):
+        if states[first] != _FREE:
+            continue
+        # last exit taken from every cell; overwriting it erases loops
+        exits: dict[int, tuple[int, Direction]] = {}
+        i = first
+        while states[i] != _IN_MAZE:
+            exits[i] = rng.choice([
+                (j, d) for j, d in _neighbors(i, width, height)
+                if states[j] != _BLOCKED
+            ])
+            i = exits[i][0]
+        i = first
+        while states[i] != _IN_MAZE:
+            j, d = exits[i]
+            _carve(maze, i, d)
+            states[i] = _IN_MAZE
+            i = j
+
+
+def _growing_tree(
+    maze: Maze,
+    width: int,
+    height: int,
+    start: Point,
+    blocked: set[Point],
+    rng: random.Random,
+) -> bytearray:
+    """
+    Growing tree: extend the newest or a random active cell.
+
+    Finished cells are swapped with the last active one, so "newest" is
+    approximate once cells start retiring from the middle of the list.
+    """
+    states = _cell_states(width, height, blocked)
+    parents = bytearray(width * height)
+    s = start[1] * width + start[0]
+    states[s] = _IN_MAZE
+    parents[s] = ROOT
+    active: list[int] = [s]
+    while active:
+        if rng.random() < _GROWING_TREE_NEWEST:
+            k = len(active) - 1
+        else:
+            k = rng.randrange(len(active))
+        i = active[k]
+        free = [
+            (j, d) for j, d in _neighbors(i, width, height)
+            if states[j] == _FREE
+        ]
+        if not free:
+            active[k] = active[-1]
+            active.pop()
+            continue
+        j, d = rng.choice(free)
+        _carve(maze, i, d)
+        parents[j] = d
+        states[j] = _IN_MAZE
+        active.append(j)
+    return parents
+
+
+def _binary_tree(
+    maze: Maze,
+    width: int,
+    height: int,
+    start: Point,
+    blocked: set[Point],
+    rng: random.Random,
+) -> None:
+    """Binary tree: every cell opens towards a random one of north/east"""
+    states = _cell_states(width, height, blocked)
+    roots: list[int] = []
+    for i in range(width * height):
+        if states[i]:
+            continue
+        options: list[Direction] = []
+        if i >= width and not states[i - width]:
+            options.append(Direction.NORTH)
+        if (i + 1) % width and not states[i + 1]:
+            options.append(Direction.EAST)
+        if options:
+            _carve(maze, i, rng.choice(options))
+        elif i != width - 1:
+            roots.append(i)
+    _join_forest(maze, states, roots, rng)
+
+
+def _sidewinder(
+    maze: Maze,
+    width: int,
+    height: int,
+    start: Point,
+    blocked: set[Point],
+    rng: random.Random,
+) -> None:
+    """
+    Sidewinder: carve east in runs, and close each run with one opening
+    north from a random cell of the run. The top row is one corridor.
+    """
+    states = _cell_states(width, height, blocked)
+    roots: list[int] = []
+    for y in range(height):
+        run: list[int] = []
+        for i in range(y * width, (y + 1) * width):
+            if states[i]:
+                continue
+            run.append(i)
+            at_end = (i + 1) % width == 0 or states[i + 1] != _FREE
+            if not at_end and (y == 0 or rng.random() < 0.5):
+                _carve(maze, i, Direction.EAST)
+                continue
+            ups = [j for j in run if y > 0 and not states[j - width]]
+            if ups:
+                _carve(maze, rng.choice(ups), Direction.NORTH)
+            elif width - 1 not in run:
+                roots.append(run[0])
+            run = []
+    _join_forest(maze, states, roots, rng)
+
+
+def _join_forest(
+    maze: Maze,
+    states: bytearray,
+    roots: list[int],
+    rng: random.Random,
+) -> None:
+    """
+    Join trees cut off by blocked cells into the main spanning tree.
+
+    Generators that only link cells north/east (binary tree, sidewinder)
+    leave a separate tree wherever a cell or run has no free cell to
+    link to. roots holds one cell of each such tree. Each tree is flood
+    filled, then joined to a different set of trees through a random
+    boundary wall, so no loop is created.
+    """
+    if not roots:
+        return
+    width, height = maze.width, maze.height
+    cells = maze.cells
+    main = len(roots)
+    owner: dict[int, int] = {}
+    trees: list[list[int]] = []
+    for t, root in enumerate(roots):
+        tree = [root]
+        owner[root] = t
+        for i in tree:
+            for j, d in _neighbors(i, width, height):
+                if not cells[i] & d and j not in owner:
+                    owner[j] = t
+                    tree.append(j)
+        trees.append(tree)
+    parent = list(range(main + 1))
+
+    def find(t: int) -> int:
+        while parent[t] != t:
+            parent[t] = parent[parent[t]]
+            t = parent[t]
+        return t
+
+    # cells of every set of trees not yet joined to the main tree
+    groups: dict[int, list[int]] = dict(enumerate(trees))
+    while groups:
+        here, group = next(iter(groups.items()))
+        walls = [
+            (i, d, there)
+            for i in group
+            for j, d in _neighbors(i, width, height)
+            if states[j] != _BLOCKED
+            and (there := find(owner.get(j, main))) != here
+        ]
+        if not walls:
+            raise ValueError("Blocked cells split the maze in two")
+        i, d, there = rng.choice(walls)
+        _carve(maze, i, d)
+        parent[here] = there
+        del groups[here]
+        if there != main:
+            groups[there].extend(group)
+
+
+def _eller_rows(
+    width: int,
+    height: int,
+    blocked: set[Point],
+    rng: random.Random,
+) -> Iterator[bytearray]:
+    """
+    Eller's algorithm, yielding each row once its walls are final.
+
+    Only the current row's set ids and a members list per set are kept.
+    Blocked cells belong to no set; a set that sits entirely above
+    blocked cells is merged sideways until it can continue downwards.
+    """
+    north, east, south, west = (
+        int(Direction.NORTH), int(Direction.EAST),
+        int(Direction.SOUTH), int(Direction.WEST),
+    )
+    blocked_rows: dict[int, set[int]] = {}
+    for bx, by in blocked:
+        blocked_rows.setdefault(by, set()).add(bx)
+    no_cells: set[int] = set()
+
+    sets = [0] * width      # set id per cell, 0 = blocked or unassigned
+    next_id = 1
+    for y in range(height):
+        here = blocked_rows.get(y, no_cells)
+        below = blocked_rows.get(y + 1, no_cells)
+        last = y == height - 1
+        row = bytearray([int(CLOSED_CELL)]) * width
+        members: dict[int, list[int]] = {}
+        for x in range(width):
+            if x in here:
+                sets[x] = 0
+                continue
+            if sets[x]:
+                row[x] &= ~north
+            else:
+                sets[x] = next_id
+                next_id += 1
+            members.setdefault(sets[x], []).append(x)
+
+        def join(x: int) -> None:
+            row[x] &= ~east
+            row[x + 1] &= ~west
+            keep, gone = sets[x], sets[x + 1]
+            if len(members[keep]) < len(members[gone]):
+                keep, gone = gone, keep
+            moved = members.pop(gone)
+            for i in moved:
+                sets[i] = keep
+            members[keep].extend(moved)
+
+        for x in range(width - 1):
+            if sets[x] and sets[x + 1] and sets[x] != sets[x + 1] and \
+                    (last or rng.random() < 0.5):
+                join(x)
+        if last:
+            yield row
+            return
+
+        while below:
+            stuck = [
+                s for s, xs in members.items()
+                if all(x in below for x in xs)
+            ]
+            if not stuck:
+                break
+            for s in stuck:
+                if s not in members:
+                    continue
+                for x in members[s]:
+                    if x + 1 < width and sets[x + 1] not in (0, s):
+                        join(x)
+                        break
+                    if x > 0 and sets[x - 1] not in (0, s):
+                        join(x - 1)
+                        break
+                else:
+                    raise ValueError(
+                        f"Blocked cells cut off part of row {y}"
+                    )
+
+        down = [0] * width
+        for s, xs in members.items():
+            options = [x for x in xs if x not in below]
+            keep = rng.choice(options)
+            for x in options:
+                if x == keep or rng.random() < 0.5:
+                    row[x] &= ~south
+                    down[x] = s
+        sets = down
+        yield row
+
+
+def _eller(
+    maze: Maze,
+    width: int,
+    height: int,
+    start: Point,
+    blocked: set[Point],
+    rng: random.Random,
+) -> None:
+    """Eller's algorithm written into an in-memory grid"""
+    for y, row in enumerate(_eller_rows(width, height, blocked, rng)):
+        maze.cells[y * width:(y + 1) * width] = row
 
 
 def _add_extra_passages(
@@ -222,34 +858,82 @@ def _add_extra_passages(
     ratio: float = 0.08,
 ) -> None:
     candidates: list[tuple[int, int, Direction]] = []
+    cells = maze.cells
     for y in range(height):
+        base = y * width
         for x in range(width):
             if (x, y) in blocked:
                 continue
-            for d in (Direction.EAST, Direction.SOUTH):
-                ddx, ddy = d.delta
-                nx, ny = x + ddx, y + ddy
-                if nx < 0 or nx >= width or ny < 0 or ny >= height:
-                    continue
-                if (nx, ny) in blocked:
-                    continue
-                if maze[y][x] & d:          # wall is currently closed
-                    candidates.append((x, y, d))
+            cell = cells[base + x]
+            # wall is closed and the neighbour is carvable
+            if x + 1 < width and cell & _EAST and \
+                    (x + 1, y) not in blocked:
+                candidates.append((x, y, Direction.EAST))
+            if y + 1 < height and cell & _SOUTH and \
+                    (x, y + 1) not in blocked:
+                candidates.append((x, y, Direction.SOUTH))
     rng.shuffle(candidates)
     target = max(1, int(len(candidates) * ratio))
+    windows = _OpenWindows(maze)
     removed = 0
     for cx, cy, cd in candidates:
         if removed >= target:
             break
-        if not _would_create_3x3_open(maze, cx, cy, cd):
-            _remove_wall(maze, cx, cy, cd)
+        if not windows.would_fill(cx, cy, cd):
+            _remove_wall(maze, cx, cy, cd, windows)
             removed += 1
 
 
 def _enforce_borders(maze: Maze, width: int, height: int) -> None:
+    cells = maze.cells
+    last_row = (height - 1) * width
     for x in range(width):
-        maze[0][x] |= Direction.NORTH
-        maze[height - 1][x] |= Direction.SOUTH
+        cells[x] |= Direction.NORTH
+        cells[last_row + x] |= Direction.SOUTH
     for y in range(height):
-        maze[y][0] |= Direction.WEST
-        maze[y][width - 1] |= Direction.EAST
+        cells[y * width] |= Direction.WEST
+        cells[y * width + width - 1] |= Direction.EAST
+
+
+# Carvers that grow one tree from the start cell return its parent links
+GeneratorFn = Callable[
+    [Maze, int, int, Point, set[Point], random.Random], bytearray | None
+]
+
+ALGORITHMS: dict[str, GeneratorFn] = {
+    "backtracking": _backtracking,
+    "kruskal": _kruskal,
+    "prim": _prim,
+    "wilson": _wilson,
+    "growing_tree": _growing_tree,
+    "eller": _eller,
+    "binary_tree": _binary_tree,
+    "sidewinder": _sidewinder,
+}
+
+# Seed contract: a SEED gives the same maze for the same ALGORITHM and
+# ALGORITHM_VERSION. Version 1 is the original generator of every
+# algorithm; a new way of drawing randomness is added as a new version
+# here rather than changing what an old one produces.
+ALGORITHM_VERSIONS: dict[tuple[str, int], GeneratorFn] = {
+    ("backtracking", 2): _backtracking_batched,
+}
+
+
+def get_carver(algorithm: str, version: int = 1) -> GeneratorFn:
+    carve = ALGORITHMS.get(algorithm)
+    if carve is None:
+        raise ValueError(
+            f"Unknown ALGORITHM {algorithm!r} "
+            f"(expected one of: {', '.join(ALGORITHMS)})"
+        )
+    if version == 1:
+        return carve
+    carve = ALGORITHM_VERSIONS.get((algorithm, version))
+    if carve is None:
+        known = [1] + [v for a, v in ALGORITHM_VERSIONS if a == algorithm]
+        raise ValueError(
+            f"ALGORITHM={algorithm} has no version {version} "
+            f"(available: {', '.join(map(str, known))})"
+        )
+    return carve
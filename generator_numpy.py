@@ -0,0 +1,156 @@
+"""
+Optional NumPy engine for generator.py.
+
+The grid is viewed zero-copy as a (height, width) uint8 array over the
+Maze bytearray, so results keep the Direction nibble encoding and the
+pure-Python post-processing can run on the same buffer.
+"""
+from __future__ import annotations
+import random
+from typing import TYPE_CHECKING, Callable, cast
+
+from utils import CLOSED_CELL, Direction, Maze, Point
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    try:
+        import numpy as np
+    except ImportError:     # the pure-Python generators are used instead
+        np = None
+
+AVAILABLE = np is not None
+
+_N = int(Direction.NORTH)
+_E = int(Direction.EAST)
+_S = int(Direction.SOUTH)
+_W = int(Direction.WEST)
+
+
+def grid_view(maze: Maze) -> "np.ndarray":
+    return np.frombuffer(maze.cells, dtype=np.uint8).reshape(
+        maze.height, maze.width
+    )
+
+
+def blocked_mask(maze: Maze, blocked: set[Point]) -> "np.ndarray":
+    mask = np.zeros((maze.height, maze.width), dtype=bool)
+    if blocked:
+        xs, ys = zip(*blocked)
+        mask[list(ys), list(xs)] = True
+    return mask
+
+
+def open_walls(
+    grid: "np.ndarray",
+    north: "np.ndarray",
+    east: "np.ndarray",
+) -> None:
+    """
+    Open the north and east walls of the flagged cells, and the matching
+    south/west walls of their neighbours.
+    """
+    clear = north * np.uint8(_N) | east * np.uint8(_E)
+    clear[:-1] |= north[1:] * np.uint8(_S)
+    clear[:, 1:] |= east[:, :-1] * np.uint8(_W)
+    grid &= ~clear
+
+
+def enforce_borders(grid: "np.ndarray") -> None:
+    grid[0] |= _N
+    grid[-1] |= _S
+    grid[:, 0] |= _W
+    grid[:, -1] |= _E
+
+
+def stamp_pattern(grid: "np.ndarray", cells: set[Point]) -> None:
+    """Close the "42" cells and the neighbour walls facing them"""
+    if not cells:
+        return
+    height, width = grid.shape
+    xs = np.fromiter((x for x, _ in cells), dtype=np.intp)
+    ys = np.fromiter((y for _, y in cells), dtype=np.intp)
+    grid[ys, xs] = int(CLOSED_CELL)
+    for d in Direction:
+        dx, dy = d.delta
+        nx, ny = xs + dx, ys + dy
+        inside = (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height)
+        grid[ny[inside], nx[inside]] |= int(d.opposite)
+
+
+def binary_tree(
+    maze: Maze,
+    blocked: set[Point],
+    rng: random.Random,
+) -> list[int]:
+    """
+    Vectorized binary tree. Returns the cells left without a parent
+    (next to blocked cells) for generator._join_forest.
+    """
+    grid = grid_view(maze)
+    gen = np.random.default_rng(rng.getrandbits(64))
+    free = ~blocked_mask(maze, blocked)
+    can_n = np.zeros_like(free)
+    can_n[1:] = free[1:] & free[:-1]
+    can_e = np.zeros_like(free)
+    can_e[:, :-1] = free[:, :-1] & free[:, 1:]
+    coin = gen.random(free.shape, dtype=np.float32) < 0.5
+    north = can_n & (coin | ~can_e)
+    east = can_e & ~north
+    open_walls(grid, north, east)
+    stuck = free & ~can_n & ~can_e
+    stuck[0, -1] = False
+    return np.flatnonzero(stuck).tolist()
+
+
+def sidewinder(
+    maze: Maze,
+    blocked: set[Point],
+    rng: random.Random,
+) -> list[int]:
+    """
+    Vectorized sidewinder. Runs are numbered with a cumulative sum over
+    run starts, and each run opens north from its highest random key.
+    Returns one cell of every run that could not open north.
+    """
+    grid = grid_view(maze)
+    height, width = grid.shape
+    gen = np.random.default_rng(rng.getrandbits(64))
+    free = ~blocked_mask(maze, blocked)
+    next_free = np.zeros_like(free)
+    next_free[:, :-1] = free[:, 1:]
+    end = free & ~next_free
+    end[1:] |= free[1:] & (gen.random((height - 1, width),
+                                      dtype=np.float32) < 0.5)
+    east = free & ~end
+
+    after_end = np.ones_like(free)
+    after_end[:, 1:] = end[:, :-1] | ~free[:, :-1]
+    starts = np.flatnonzero(free & after_end)
+    run_of = np.cumsum((free & after_end).ravel()) - 1
+
+    can_n = np.zeros_like(free)
+    can_n[1:] = free[1:] & free[:-1]
+    key = np.where(
+        can_n.ravel(),
+        gen.random(width * height, dtype=np.float32),
+        np.float32(-1),
+    )
+    best = np.maximum.reduceat(key, starts)
+    chosen = np.flatnonzero((key >= 0) & (key == best[run_of]))
+    _, first = np.unique(run_of[chosen], return_index=True)
+    north = np.zeros(width * height, dtype=bool)
+    north[chosen[first]] = True
+    open_walls(grid, north.reshape(height, width), east)
+
+    stuck = best < 0
+    stuck[run_of[width - 1]] = False
+    return cast("list[int]", starts[stuck].tolist())
+
+
+GeneratorFn = Callable[[Maze, set[Point], random.Random], list[int]]
+
+ALGORITHMS: dict[str, GeneratorFn] = {
+    "binary_tree": binary_tree,
+    "sidewinder": sidewinder,
+}
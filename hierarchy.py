@@ -0,0 +1,381 @@
+from __future__ import annotations
+
+import struct
+import sys
+import zlib
+from array import array
+from typing import BinaryIO, Iterable
+
+from utils import Direction, Maze, Point
+
+CLUSTER = 16
+
+_MAGIC = b"HPA1"
+# magic, width, height, cluster size, crc32 of the cells, nodes, edges
+_HEADER = struct.Struct("<4s6I")
+
+_STEPS = tuple((int(d), int(d.opposite), *d.delta) for d in Direction)
+_BY_BIT = {int(d): d for d in Direction}
+_N, _E, _S, _W = (int(d) for d in Direction)
+
+
+def _local_search(
+    maze: Maze,
+    size: int,
+    src: int,
+    targets: set[int],
+) -> tuple[dict[int, int], dict[int, int]]:
+    """
+    BFS from cell src that never leaves src's cluster, stopping once every
+    target is found. Returns (came_from bit per reached cell, distance per
+    found target).
+    """
+    cells, w = maze.cells, maze.width
+    x0 = src % w // size * size
+    y0 = src // w // size * size
+    x1 = min(x0 + size, w)
+    y1 = min(y0 + size, maze.height)
+    came = {src: 0}
+    found = {src: 0} if src in targets else {}
+    left = len(targets) - len(found)
+    frontier = [src]
+    depth = 0
+    while frontier and left:
+        depth += 1
+        grown = []
+        for i in frontier:
+            c = cells[i]
+            x, y = i % w, i // w
+            for bit, back, dx, dy in _STEPS:
+                nx, ny = x + dx, y + dy
+                if c & bit or not (x0 <= nx < x1 and y0 <= ny < y1):
+                    continue
+                j = ny * w + nx
+                if j in came or cells[j] & back:
+                    continue
+                came[j] = bit
+                if j in targets:
+                    found[j] = depth
+                    left -= 1
+                grown.append(j)
+        frontier = grown
+    return came, found
+
+
+def _unwind(came: dict[int, int], w: int, end: int) -> list[Direction]:
+    path: list[Direction] = []
+    while bit := came[end]:
+        d = _BY_BIT[bit]
+        path.append(d)
+        dx, dy = d.delta
+        end -= dy * w + dx
+    path.reverse()
+    return path
+
+
+def _write_array(f: BinaryIO, values: array[int]) -> None:
+    if sys.byteorder == "big":
+        values = array("i", values)
+        values.byteswap()
+    values.tofile(f)
+
+
+def _read_array(f: BinaryIO, count: int) -> array[int]:
+    values = array("i")
+    try:
+        values.fromfile(f, count)
+    except EOFError:
+        raise ValueError("Truncated hierarchy index")
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class HierarchyIndex:
+    """
+    HPA*-style abstract graph of a maze split into square clusters.
+
+    Each run of open crossings between two neighbouring clusters is one
+    entrance, with a node on both sides of its middle crossing. Nodes of
+    one cluster are joined by their exact distance inside the cluster.
+    Nodes are stored cluster by cluster (cluster c owns ids first[c] to
+    first[c + 1] - 1) and edges in CSR form (offsets, targets, costs).
+
+    Queries search this graph, then refine each leg with a BFS confined
+    to one cluster. Paths are exact on perfect mazes; with loops they can
+    be a few steps longer than the shortest, as with any HPA*.
+    """
+
+    __slots__ = (
+        "width", "height", "cluster", "crc",
+        "nodes", "first", "offsets", "targets", "costs",
+    )
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        cluster: int,
+        crc: int,
+        nodes: array[int],
+        first: array[int],
+        offsets: array[int],
+        targets: array[int],
+        costs: array[int],
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.cluster = cluster
+        self.crc = crc
+        self.nodes = nodes
+        self.first = first
+        self.offsets = offsets
+        self.targets = targets
+        self.costs = costs
+
+    @classmethod
+    def build(cls, maze: Maze, cluster: int = CLUSTER) -> HierarchyIndex:
+        if cluster < 2:
+            raise ValueError("Cluster size must be at least 2")
+        w, h = maze.width, maze.height
+        cells = maze.cells
+        cols = -(-w // cluster)
+        rows = -(-h // cluster)
+
+        crossings: dict[int, list[int]] = {}
+
+        def entrance(run: list[tuple[int, int]]) -> None:
+            if run:
+                a, b = run[len(run) // 2]
+                crossings.setdefault(a, []).append(b)
+                crossings.setdefault(b, []).append(a)
+                run.clear()
+
+        # A run of crossings only goes on while both sides stay connected
+        # along the border, so any of them can reach the middle one
+        run: list[tuple[int, int]] = []
+        for x in range(cluster - 1, w - 1, cluster):
+            for y0 in range(0, h, cluster):
+                for y in range(y0, min(y0 + cluster, h)):
+                    i = y * w + x
+                    if cells[i] & _E or cells[i + 1] & _W:
+                        entrance(run)
+                        continue
+                    if run and ((cells[i] | cells[i + 1]) & _N
+                                or (cells[i - w] | cells[i + 1 - w]) & _S):
+                        entrance(run)
+                    run.append((i, i + 1))
+                entrance(run)
+        for y in range(cluster - 1, h - 1, cluster):
+            for x0 in range(0, w, cluster):
+                for x in range(x0, min(x0 + cluster, w)):
+                    i = y * w + x
+                    if cells[i] & _S or cells[i + w] & _N:
+                        entrance(run)
+                        continue
+                    if run and ((cells[i] | cells[i + w]) & _W
+                                or (cells[i - 1] | cells[i + w - 1]) & _E):
+                        entrance(run)
+                    run.append((i, i + w))
+                entrance(run)
+
+        by_cluster: list[list[int]] = [[] for _ in range(cols * rows)]
+        for i in crossings:
+            by_cluster[i // w // cluster * cols + i % w // cluster].append(i)
+        nodes = array("i")
+        first = array("i", [0])
+        for members in by_cluster:
+            nodes.extend(sorted(members))
+            first.append(len(nodes))
+        ids = {i: k for k, i in enumerate(nodes)}
+
+        offsets = array("i", [0])
+        targets = array("i")
+        costs = array("i")
+        for c in range(cols * rows):
+            members = list(nodes[first[c]:first[c + 1]])
+            inside: dict[int, list[tuple[int, int]]] = {
+                i: [] for i in members
+            }
+            for p, i in enumerate(members):
+                rest = set(members[p + 1:])
+                _, found = _local_search(maze, cluster, i, rest)
+                for j, d in found.items():
+                    inside[i].append((ids[j], d))
+                    inside[j].append((ids[i], d))
+            for i in members:
+                for j in crossings[i]:
+                    targets.append(ids[j])
+                    costs.append(1)
+                for k, d in inside[i]:
+                    targets.append(k)
+                    costs.append(d)
+                offsets.append(len(targets))
+        return cls(
+            w, h, cluster, zlib.crc32(cells),
+            nodes, first, offsets, targets, costs,
+        )
+
+    def matches(self, maze: Maze) -> bool:
+        return (self.width, self.height, self.crc) == \
+            (maze.width, maze.height, zlib.crc32(maze.cells))
+
+    def _cluster_nodes(self, i: int) -> range:
+        size = self.cluster
+        cols = -(-self.width // size)
+        c = i // self.width // size * cols + i % self.width // size
+        return range(self.first[c], self.first[c + 1])
+
+    def path(
+        self,
+        maze: Maze,
+        start: Point,
+        end: Point,
+    ) -> list[Direction] | None:
+        """Path from start to end in maze, or None if there is none"""
+        if (maze.width, maze.height) != (self.width, self.height):
+            raise ValueError("Hierarchy index was built for another maze")
+        w, size = self.width, self.cluster
+        s = start[1] * w + start[0]
+        e = end[1] * w + end[0]
+        if s == e:
+            return []
+        nodes, offsets = self.nodes, self.offsets
+        targets, costs = self.targets, self.costs
+
+        # Start and end join the graph as ids n and n + 1, linked to the
+        # nodes of their own clusters (and to each other if they share one)
+        n = len(nodes)
+        near_s = {nodes[k]: k for k in self._cluster_nodes(s)}
+        near_e = {nodes[k]: k for k in self._cluster_nodes(e)}
+        near_s[e] = n + 1
+        _, found = _local_search(maze, size, s, set(near_s))
+        from_start = [(near_s[i], d) for i, d in found.items()]
+        _, found = _local_search(maze, size, e, set(near_e))
+        into_end = {near_e[i]: d for i, d in found.items()}
+
+        def cell(k: int) -> int:
+            return nodes[k] if k < n else (s if k == n else e)
+
+        # A* with a bucket per f value (edge costs are small ints)
+        ex, ey = end
+        best = array("i", [-1]) * (n + 2)
+        h = array("i", [0]) * (n + 2)
+        prev = array("i", [-1]) * (n + 2)
+        best[n] = 0
+        h[n] = abs(start[0] - ex) + abs(start[1] - ey)
+        f = top = h[n]
+        buckets: dict[int, list[int]] = {f: [n]}
+        while f <= top:
+            bucket = buckets.pop(f, None)
+            while bucket:
+                k = bucket.pop()
+                g = best[k]
+                if g + h[k] != f:
+                    continue            # improved since it was queued
+                if k == n + 1:
+                    route = self._route(prev, k, n)
+                    return self._refine(maze, [cell(k) for k in route])
+                if k == n:
+                    edges: Iterable[tuple[int, int]] = from_start
+                else:
+                    lo, hi = offsets[k], offsets[k + 1]
+                    edges = zip(targets[lo:hi], costs[lo:hi])
+                    if k in into_end:
+                        edges = [*edges, (n + 1, into_end[k])]
+                for j, d in edges:
+                    gj = g + d
+                    old = best[j]
+                    if old < 0 or gj < old:
+                        if old < 0:
+                            c = cell(j)
+                            h[j] = abs(c % w - ex) + abs(c // w - ey)
+                        best[j] = gj
+                        prev[j] = k
+                        fj = gj + h[j]
+                        if fj == f:
+                            bucket.append(j)
+                        else:
+                            buckets.setdefault(fj, []).append(j)
+                            top = max(top, fj)
+            f += 1
+        return None
+
+    @staticmethod
+    def _route(prev: array[int], k: int, root: int) -> list[int]:
+        route = [k]
+        while k != root:
+            k = prev[k]
+            route.append(k)
+        route.reverse()
+        return route
+
+    def _refine(self, maze: Maze, route: list[int]) -> list[Direction]:
+        """
+        Expand consecutive route cells into steps, one cluster at a time,
+        dropping any step that undoes the previous one.
+        """
+        w, size = self.width, self.cluster
+        path: list[Direction] = []
+        for a, b in zip(route, route[1:]):
+            if a == b:
+                continue
+            came, _ = _local_search(maze, size, a, {b})
+            if b in came:
+                leg = _unwind(came, w, b)
+            else:                       # a crossing into the next cluster
+                delta = (b % w - a % w, b // w - a // w)
+                leg = [next(d for d in Direction if d.delta == delta)]
+            for d in leg:
+                if path and path[-1] == d.opposite:
+                    path.pop()
+                else:
+                    path.append(d)
+        return path
+
+    def save(self, filename: str) -> None:
+        with open(filename, "wb") as f:
+            f.write(_HEADER.pack(
+                _MAGIC, self.width, self.height, self.cluster, self.crc,
+                len(self.nodes), len(self.targets),
+            ))
+            for values in (self.nodes, self.first, self.offsets,
+                           self.targets, self.costs):
+                _write_array(f, values)
+
+    @classmethod
+    def load(cls, filename: str) -> HierarchyIndex:
+        with open(filename, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size or header[:4] != _MAGIC:
+                raise ValueError(f"{filename} is not a hierarchy index")
+            _, w, h, size, crc, n, m = _HEADER.unpack(header)
+            clusters = -(-w // size) * -(-h // size)
+            return cls(
+                w, h, size, crc,
+                nodes=_read_array(f, n),
+                first=_read_array(f, clusters + 1),
+                offsets=_read_array(f, n + 1),
+                targets=_read_array(f, m),
+                costs=_read_array(f, m),
+            )
+
+
+def index_for(
+    maze: Maze,
+    filename: str,
+    cluster: int = CLUSTER,
+) -> HierarchyIndex:
+    """
+    The index saved in filename if it was built for this exact maze and
+    cluster size, else a fresh one, which is then saved there.
+    """
+    try:
+        index = HierarchyIndex.load(filename)
+        if index.cluster == cluster and index.matches(maze):
+            return index
+    except (OSError, ValueError):
+        pass
+    index = HierarchyIndex.build(maze, cluster)
+    index.save(filename)
+    return index
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from collections import deque
+
+from solution import (
+    DistanceField,
+    _reconstruct_path,
+    _steps,
+    open_directions,
+)
+from utils import Direction, Maze, Point
+
+
+class IncrementalSolver:
+    """
+    Shortest paths from one start cell, kept up to date as walls change.
+
+    One full BFS at construction; after that each wall edit only revisits
+    the cells whose distance it can change (the idea behind LPA* and
+    D* Lite, simplified for unit-cost grids):
+
+    - opening a wall can only shorten paths, so the shorter distances are
+      pushed outwards from the newly reachable side;
+    - closing a wall only matters if it was the parent link of a cell in
+      the shortest-path tree. The cells below it that still have another
+      neighbour one step closer to the start keep their distance; the
+      rest are cleared and re-seeded from their unaffected neighbours.
+
+    Edit walls through open_wall/close_wall, or call wall_changed after
+    editing maze.cells directly.
+    """
+
+    __slots__ = ("maze", "start", "width", "mask", "steps",
+                 "dist", "came_from")
+
+    def __init__(self, maze: Maze, start: Point) -> None:
+        field = DistanceField(maze, start)
+        self.maze = maze
+        self.start = start
+        self.width = maze.width
+        self.mask = open_directions(maze)
+        self.steps = _steps(maze.width)
+        self.dist = field.dist
+        self.came_from = field.came_from
+
+    def distance(self, end: Point) -> int | None:
+        d = self.dist[end[1] * self.width + end[0]]
+        return d if d >= 0 else None
+
+    def path(self, end: Point) -> list[Direction] | None:
+        e = end[1] * self.width + end[0]
+        if not self.came_from[e]:
+            return None
+        return _reconstruct_path(self.came_from, self.width, e)
+
+    def open_wall(self, x: int, y: int, d: Direction) -> None:
+        self._set_wall(x, y, d, closed=False)
+
+    def close_wall(self, x: int, y: int, d: Direction) -> None:
+        self._set_wall(x, y, d, closed=True)
+
+    def _set_wall(self, x: int, y: int, d: Direction, closed: bool) -> None:
+        maze = self.maze
+        dx, dy = d.delta
+        sides = [(x, y, d), (x + dx, y + dy, d.opposite)]
+        for cx, cy, bit in sides:
+            if 0 <= cx < maze.width and 0 <= cy < maze.height:
+                i = cy * maze.width + cx
+                cells = maze.cells
+                cells[i] = cells[i] | bit if closed else cells[i] & ~bit
+        maze.touch()
+        self.wall_changed(x, y, d)
+
+    def wall_changed(self, x: int, y: int, d: Direction) -> None:
+        """Update after the wall on side d of cell (x, y) was edited"""
+        maze = self.maze
+        dx, dy = d.delta
+        nx, ny = x + dx, y + dy
+        if not (0 <= nx < maze.width and 0 <= ny < maze.height):
+            return                          # border walls never open
+        w = self.width
+        i, j = y * w + x, ny * w + nx
+        bit, back = int(d), int(d.opposite)
+        cells, mask = maze.cells, self.mask
+        mask[i] = mask[i] & ~bit if cells[i] & bit else mask[i] | bit
+        mask[j] = mask[j] & ~back if cells[j] & back else mask[j] | back
+        if mask[i] & bit and mask[j] & back:
+            self._opened(i, j, bit, back)
+        elif self.came_from[j] == bit:
+            self._cut(j)
+        elif self.came_from[i] == back:
+            self._cut(i)
+
+    def _opened(self, i: int, j: int, bit: int, back: int) -> None:
+        dist, came_from = self.dist, self.came_from
+        for a, b, link in ((i, j, bit), (j, i, back)):
+            if dist[a] >= 0 and (dist[b] < 0 or dist[a] + 1 < dist[b]):
+                dist[b] = dist[a] + 1
+                came_from[b] = link
+                self._lower(deque([b]))
+                return
+
+    def _lower(self, queue: deque[int]) -> None:
+        """Push shorter distances outwards from the cells in queue"""
+        dist, came_from, mask = self.dist, self.came_from, self.mask
+        steps = self.steps
+        while queue:
+            k = queue.popleft()
+            m = mask[k]
+            dk = dist[k] + 1
+            for bit, step, back, _, _ in steps:
+                if m & bit:
+                    n = k + step
+                    if mask[n] & back and (dist[n] < 0 or dk < dist[n]):
+                        dist[n] = dk
+                        came_from[n] = bit
+                        queue.append(n)
+
+    def _cut(self, child: int) -> None:
+        """The parent link of child was closed: repair its subtree"""
+        dist, came_from, mask = self.dist, self.came_from, self.mask
+        steps = self.steps
+
+        # Level by level, so a cell's closer neighbours are settled first
+        lost: set[int] = set()
+        queue = deque([child])
+        while queue:
+            k = queue.popleft()
+            m = mask[k]
+            up = dist[k] - 1
+            for bit, step, back, _, _ in steps:
+                n = k + step
+                if m & bit and mask[n] & back and dist[n] == up \
+                        and n not in lost:
+                    came_from[k] = back
+                    break
+            else:
+                lost.add(k)
+                for bit, step, back, _, _ in steps:
+                    n = k + step
+                    if m & bit and mask[n] & back and came_from[n] == bit:
+                        queue.append(n)
+
+        for k in lost:
+            dist[k] = -1
+            came_from[k] = 0
+        # Re-seed the lost cells from the rest of the tree, then settle
+        # them in distance order (one bucket per distance)
+        buckets: dict[int, list[int]] = {}
+        for k in lost:
+            m = mask[k]
+            for bit, step, back, _, _ in steps:
+                n = k + step
+                if m & bit and mask[n] & back and dist[n] >= 0 \
+                        and (dist[k] < 0 or dist[n] + 1 < dist[k]):
+                    dist[k] = dist[n] + 1
+                    came_from[k] = back
+            if dist[k] >= 0:
+                buckets.setdefault(dist[k], []).append(k)
+        for d in sorted(buckets):
+            self._lower(deque(k for k in buckets[d] if dist[k] == d))
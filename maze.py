@@ -1,29 +1,187 @@
 
 from __future__ import annotations
+import io
 import logging
-import sys
-from generator import generate_maze
-from solution import solve, path_to_str
-from utils import Config, Direction, dump_maze
-
-def _generate_and_solve(cfg: Config, logger: logging.Logger) -> \
-        tuple[list[list[int]], list[Direction] | None]:
-    maze = generate_maze(
+import mmap
+import shutil
+import tempfile
+from typing import BinaryIO, Iterable, Iterator
+from generator import generate_maze_tree, generate_rows
+from hierarchy import HierarchyIndex, index_for
+from solution import (
+    get_solver,
+    path_from_parents,
+    path_to_str,
+    solve,
+    walk_tree_path,
+)
+from tiled import generate_tiled, tiled_path
+from utils import (
+    Config,
+    Direction,
+    Maze,
+    dump_maze,
+    hex_cell_reader,
+    is_compressed,
+    open_maze_file,
+    write_hex_rows,
+    write_maze,
+    write_trailer,
+)
+
+
+def _generate_and_solve(
+    cfg: Config,
+    logger: logging.Logger,
+    index_file: str | None = None,
+) -> tuple[Maze, list[Direction] | None]:
+    # Fail before generating. HPA* paths through loops can be a few
+    # steps longer than the shortest, which OUTPUT_FILE must hold
+    if cfg.solver != "hierarchical":
+        get_solver(cfg.solver)
+    elif not cfg.perfect:
+        raise ValueError("SOLVER=hierarchical needs PERFECT=True")
+    maze, parents = generate_maze_tree(
         cfg.width,
         cfg.height,
         cfg.entry,
         cfg.exit,
         perfect=cfg.perfect,
         seed=cfg.seed,
+        algorithm=cfg.algorithm,
+        version=cfg.algorithm_version,
+        engine=cfg.engine,
     )
 
-    path = solve(maze, cfg.entry, cfg.exit)
+    if parents is not None:
+        # Perfect maze grown from the entry: its only path is in the tree
+        path = path_from_parents(parents, cfg.width, cfg.exit)
+    elif cfg.solver == "hierarchical":
+        # Reused from index_file when a previous run saved one for this
+        # exact maze (same config and seed)
+        if index_file is None:
+            index = HierarchyIndex.build(maze)
+        else:
+            index = index_for(maze, index_file)
+            logger.info("Hierarchy index in %s", index_file)
+        path = index.path(maze, cfg.entry, cfg.exit)
+    else:
+        path = solve(maze, cfg.entry, cfg.exit, cfg.solver)
     return maze, path
 
+
 def make_maze(cfg: Config, logger: logging.Logger) -> \
-        tuple[list[list[int]], list[Direction] | None]:
-    maze, path = _generate_and_solve(cfg, logger)
+        tuple[Maze, list[Direction] | None]:
+    maze, path = _generate_and_solve(
+        cfg, logger, index_file=cfg.output_file + ".hpa"
+    )
     dump_maze(maze, cfg.entry, cfg.exit, path or [], cfg.output_file)
     logger.info("Maze written to %s", cfg.output_file)
-    logger.info("Shortest path (%d steps): %s", len(path), path_to_str(path))
-    return maze, path
\ No newline at end of file
+    steps = path or []
+    logger.info(
+        "Shortest path (%d steps): %s", len(steps), path_to_str(steps)
+    )
+    return maze, path
+
+
+def maze_text(cfg: Config, logger: logging.Logger) -> str:
+    """Generate and solve a maze, returning it in the dump_maze format."""
+    maze, path = _generate_and_solve(cfg, logger)
+    buf = io.StringIO()
+    write_maze(buf, maze, cfg.entry, cfg.exit, path or [])
+    return buf.getvalue()
+
+
+def _append_trailer(
+    f: BinaryIO,
+    cfg: Config,
+    path: Iterable[Direction],
+) -> None:
+    text = io.TextIOWrapper(f, encoding="ascii", newline="\n")
+    write_trailer(text, cfg.entry, cfg.exit, path)
+    text.detach()
+
+
+def stream_maze(cfg: Config, logger: logging.Logger) -> list[Direction]:
+    """
+    Write a perfect Eller maze to cfg.output_file one row at a time.
+
+    The grid never lives in memory: rows go straight to the file, and the
+    path is traced afterwards by wall following over the mmapped grid.
+    """
+    if not cfg.perfect:
+        raise ValueError("Streaming generation needs PERFECT=True")
+    rows = generate_rows(
+        cfg.width, cfg.height, cfg.entry, cfg.exit, seed=cfg.seed
+    )
+    # A compressed file cannot be mapped, so its grid goes through a
+    # temporary file first and is copied in once the path is known
+    compressed = is_compressed(cfg.output_file)
+    with (tempfile.TemporaryFile() if compressed
+          else open(cfg.output_file, "w+b")) as grid:
+        write_hex_rows(grid, rows)
+        grid.flush()
+        with mmap.mmap(grid.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            cell_at = hex_cell_reader(mm, cfg.width)
+            path = walk_tree_path(
+                cell_at, cfg.width, cfg.height, cfg.entry, cfg.exit
+            )
+        if path is None:
+            raise ValueError("Exit is not reachable from entry")
+        if compressed:
+            grid.seek(0)
+            with open_maze_file(cfg.output_file, "wb") as out:
+                shutil.copyfileobj(grid, out)
+                _append_trailer(out, cfg, path)
+        else:
+            _append_trailer(grid, cfg, path)
+    logger.info("Maze written to %s", cfg.output_file)
+    logger.info("Shortest path: %d steps", len(path))
+    return path
+
+
+def tiled_maze(cfg: Config, logger: logging.Logger) -> int:
+    """
+    Generate cfg's maze tile by tile into cfg.output_file + ".tiles",
+    then write cfg.output_file from it. Returns the path length.
+
+    Memory is a few tiles plus one band of rows, whatever the maze size,
+    and the path is solved one tile at a time.
+    """
+    # Each tile is solved on its own, so there is no index to build
+    if cfg.solver == "hierarchical":
+        raise ValueError("--tiled does not support SOLVER=hierarchical")
+    get_solver(cfg.solver)              # fail before generating
+    tiles_file = cfg.output_file + ".tiles"
+    maze, layout = generate_tiled(
+        tiles_file,
+        cfg.width,
+        cfg.height,
+        cfg.entry,
+        cfg.exit,
+        perfect=cfg.perfect,
+        seed=cfg.seed,
+        algorithm=cfg.algorithm,
+        version=cfg.algorithm_version,
+    )
+    with maze:
+        legs = tiled_path(maze, layout, cfg.entry, cfg.exit, cfg.solver)
+        if legs is None:
+            raise ValueError("Exit is not reachable from entry")
+        steps = 0
+
+        def counted(legs: Iterator[list[Direction]]) -> Iterator[Direction]:
+            nonlocal steps
+            for leg in legs:
+                steps += len(leg)
+                yield from leg
+
+        with open_maze_file(cfg.output_file, "wb") as raw:
+            write_hex_rows(raw, maze.rows())
+            text = io.TextIOWrapper(raw, encoding="ascii", newline="\n")
+            write_trailer(text, cfg.entry, cfg.exit, counted(legs))
+            text.detach()
+    logger.info("Tiles kept in %s", tiles_file)
+    logger.info("Maze written to %s", cfg.output_file)
+    logger.info("Shortest path: %d steps", steps)
+    return steps
@@ -1,12 +1,18 @@
-from collections import deque
-from typing import Sequence
-from utils import Maze, Point, Direction, CLOSED_CELL
+from __future__ import annotations
+
+import weakref
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from heapq import heappop, heappush
+from typing import Callable, Generic, Iterable, Iterator, Sequence, TypeVar
+from utils import Maze, Point, Direction, ROOT
+
+T = TypeVar("T")
 
 
 def maze_dims(maze: Maze) -> tuple[int, int]:
-    height = len(maze)
-    width = len(maze[0]) if height else 0
-    return width, height
+    return maze.width, maze.height
 
 
 def in_bounds(x: int, y: int, width: int, height: int) -> bool:
@@ -18,7 +24,7 @@ def can_move(maze: Maze, x: int, y: int, direction: Direction) -> bool:
     if not in_bounds(x, y, width, height):
         return False
 
-    if maze[y][x] & direction:
+    if maze.cells[y * width + x] & direction:
         return False
 
     dx, dy = direction.delta
@@ -27,7 +33,7 @@ def can_move(maze: Maze, x: int, y: int, direction: Direction) -> bool:
     if not in_bounds(nx, ny, width, height):
         return False
 
-    if maze[ny][nx] & direction.opposite:
+    if maze.cells[ny * width + nx] & direction.opposite:
         return False
 
     return True
@@ -46,45 +52,660 @@ def get_neighbors(
     return result
 
 
+_BY_BIT: dict[int, Direction] = {int(d): d for d in Direction}
+# wall byte -> directions open on that cell's side
+_OPEN = bytes(~c & 0xF for c in range(256))
+
+
+def open_directions(maze: Maze) -> bytearray:
+    """
+    One byte per cell with the bits of the directions open on the cell's
+    own side, border walls cleared. Built with one bytes.translate pass;
+    a move is allowed (as in can_move) when the neighbour also has the
+    opposite bit set.
+    """
+    width, height = maze.width, maze.height
+    mask = maze.cells.translate(_OPEN)
+    last = (height - 1) * width
+    for x in range(width):
+        mask[x] &= ~Direction.NORTH
+        mask[last + x] &= ~Direction.SOUTH
+    for i in range(0, width * height, width):
+        mask[i] &= ~Direction.WEST
+        mask[i + width - 1] &= ~Direction.EAST
+    return mask
+
+
+def _steps(width: int) -> tuple[tuple[int, int, int, int, int], ...]:
+    """(bit, index step, opposite bit, dx, dy) in Direction order"""
+    return tuple(
+        (int(d), d.delta[1] * width + d.delta[0], int(d.opposite), *d.delta)
+        for d in Direction
+    )
+
+
 def solve(
     maze: Maze,
     start: Point,
     end: Point,
-) -> list[Direction]:
+    solver: str = "bfs",
+) -> list[Direction] | None:
+    """
+    Shortest path from start to end, or None if end is unreachable.
+
+    All solvers return a shortest path; bfs breaks ties the same way as
+    it always did, the others may pick a different one of equal length.
+    """
+    search = get_solver(solver)
     if start == end:
         return []
+    return search(maze, start, end)
 
-    width, height = maze_dims(maze)
-    sx, sy = start
-    ex, ey = end
 
-    visited: dict[Point, tuple[Point, Direction] | None] = {start: None}
-    queue: deque[Point] = deque([start])
+def get_solver(
+    name: str,
+) -> Callable[[Maze, Point, Point], list[Direction] | None]:
+    search = SOLVERS.get(name)
+    if search is None:
+        raise ValueError(
+            f"Unknown SOLVER {name!r} "
+            f"(expected one of: {', '.join(SOLVERS)})"
+        )
+    return search
+
+
+def _bfs(maze: Maze, start: Point, end: Point) -> list[Direction] | None:
+    width = maze.width
+    mask = open_directions(maze)
+    steps = _steps(width)
+    s = start[1] * width + start[0]
+    e = end[1] * width + end[0]
+
+    came_from = bytearray(len(mask))
+    came_from[s] = ROOT
+    queue: deque[int] = deque([s])
 
     while queue:
-        cx, cy = queue.popleft()
-        for nx, ny, d in get_neighbors(maze, cx, cy):
-            if (nx, ny) not in visited:
-                visited[(nx, ny)] = ((cx, cy), d)
-                if (nx, ny) == end:
-                    return _reconstruct_path(visited, end)
-                queue.append((nx, ny))
+        i = queue.popleft()
+        m = mask[i]
+        for bit, step, back, _, _ in steps:
+            if m & bit:
+                j = i + step
+                if not came_from[j] and mask[j] & back:
+                    came_from[j] = bit
+                    if j == e:
+                        return _reconstruct_path(came_from, width, e)
+                    queue.append(j)
+    return None
 
 
-def _reconstruct_path(
-    visited: dict[Point, tuple[Point, Direction] | None],
+def _astar(maze: Maze, start: Point, end: Point) -> list[Direction] | None:
+    """A* with the Manhattan distance, ties going to cells nearer the end"""
+    width = maze.width
+    mask = open_directions(maze)
+    steps = _steps(width)
+    ex, ey = end
+    s = start[1] * width + start[0]
+    e = ey * width + ex
+
+    came_from = bytearray(len(mask))
+    came_from[s] = ROOT
+    best: dict[int, int] = {s: 0}
+    h = abs(start[0] - ex) + abs(start[1] - ey)
+    heap: list[tuple[int, int, int]] = [(h, h, s)]
+
+    while heap:
+        f, h, i = heappop(heap)
+        g = f - h
+        if g > best[i]:
+            continue                    # stale entry
+        if i == e:
+            return _reconstruct_path(came_from, width, e)
+        x, y = i % width, i // width
+        m = mask[i]
+        for bit, step, back, dx, dy in steps:
+            if m & bit:
+                j = i + step
+                if mask[j] & back and g + 1 < best.get(j, g + 2):
+                    best[j] = g + 1
+                    came_from[j] = bit
+                    hj = abs(x + dx - ex) + abs(y + dy - ey)
+                    heappush(heap, (g + 1 + hj, hj, j))
+    return None
+
+
+def _bidirectional(
+    maze: Maze,
+    start: Point,
     end: Point,
+) -> list[Direction] | None:
+    """
+    BFS from both ends, always growing the smaller frontier by one level.
+    Levels are expanded whole, so the first cell seen from both sides
+    lies on a shortest path.
+    """
+    width = maze.width
+    mask = open_directions(maze)
+    steps = _steps(width)
+    s = start[1] * width + start[0]
+    e = end[1] * width + end[0]
+
+    seen = (bytearray(len(mask)), bytearray(len(mask)))
+    seen[0][s] = ROOT
+    seen[1][e] = ROOT
+    frontiers = ([s], [e])
+
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        mine, other = seen[side], seen[1 - side]
+        grown: list[int] = []
+        for i in frontiers[side]:
+            m = mask[i]
+            for bit, step, back, _, _ in steps:
+                if m & bit:
+                    j = i + step
+                    if not mine[j] and mask[j] & back:
+                        mine[j] = bit
+                        if other[j]:
+                            head = _reconstruct_path(seen[0], width, j)
+                            tail = _reconstruct_path(seen[1], width, j)
+                            return head + [
+                                d.opposite for d in reversed(tail)
+                            ]
+                        grown.append(j)
+        frontiers = (grown, frontiers[1]) if side == 0 \
+            else (frontiers[0], grown)
+    return None
+
+
+def _reconstruct_path(
+    came_from: bytearray,
+    width: int,
+    end: int,
 ) -> list[Direction]:
+    """Follow came_from bits back from linear cell end to the search root"""
+    back = {
+        int(d): -(d.delta[1] * width + d.delta[0]) for d in Direction
+    }
     path: list[Direction] = []
     cur = end
-    while (node_info := visited[cur]) is not None:
-        prev, d = node_info
-        path.append(d)
-        cur = prev
+    while (bit := came_from[cur]) != ROOT:
+        path.append(_BY_BIT[bit])
+        cur += back[bit]
     path.reverse()
     return path
 
 
+def path_from_parents(
+    parents: bytearray,
+    width: int,
+    end: Point,
+) -> list[Direction] | None:
+    """
+    Path from the root of a parent-link tree (generator.generate_maze_tree)
+    to end in O(path length), or None if end is not in the tree.
+    """
+    e = end[1] * width + end[0]
+    if not parents[e]:
+        return None
+    return _reconstruct_path(parents, width, e)
+
+
+class DistanceField:
+    """
+    BFS distances and predecessors from one source to every cell.
+
+    dist holds -1 for unreachable cells; paths are rebuilt on demand from
+    came_from with _reconstruct_path.
+    """
+
+    __slots__ = ("width", "source", "dist", "came_from")
+
+    def __init__(self, maze: Maze, source: Point) -> None:
+        width = maze.width
+        mask = open_directions(maze)
+        steps = _steps(width)
+        s = source[1] * width + source[0]
+        came_from = bytearray(len(mask))
+        came_from[s] = ROOT
+        dist = array("i", [-1]) * len(mask)
+        dist[s] = 0
+        queue: deque[int] = deque([s])
+        while queue:
+            i = queue.popleft()
+            m = mask[i]
+            di = dist[i] + 1
+            for bit, step, back, _, _ in steps:
+                if m & bit:
+                    j = i + step
+                    if not came_from[j] and mask[j] & back:
+                        came_from[j] = bit
+                        dist[j] = di
+                        queue.append(j)
+        self.width = width
+        self.source = source
+        self.dist = dist
+        self.came_from = came_from
+
+    def distance(self, target: Point) -> int | None:
+        d = self.dist[target[1] * self.width + target[0]]
+        return d if d >= 0 else None
+
+    def path(self, target: Point) -> list[Direction] | None:
+        t = target[1] * self.width + target[0]
+        if not self.came_from[t]:
+            return None
+        return _reconstruct_path(self.came_from, self.width, t)
+
+
+class _MazeCache(Generic[T]):
+    """
+    LRU of values built from a maze, keyed by (maze, maze.version, args).
+    The maze itself is held weakly so a recycled id() never matches.
+    """
+
+    def __init__(self, build: Callable[..., T], maxsize: int) -> None:
+        self.build = build
+        self.maxsize = maxsize
+        self.entries: OrderedDict[
+            tuple[int, int, tuple[object, ...]],
+            tuple[weakref.ref[Maze], T],
+        ] = OrderedDict()
+
+    def get(self, maze: Maze, *args: object) -> T:
+        key = (id(maze), maze.version, args)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0]() is maze:
+            self.entries.move_to_end(key)
+            return entry[1]
+        value = self.build(maze, *args)
+        self.entries[key] = (weakref.ref(maze), value)
+        self.entries.move_to_end(key)
+        self.trim()
+        return value
+
+    def trim(self) -> None:
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+_fields = _MazeCache(DistanceField, maxsize=8)
+
+
+def distance_field(maze: Maze, source: Point) -> DistanceField:
+    """Distance field from source, reused until the maze is touch()ed"""
+    return _fields.get(maze, source)
+
+
+def set_distance_cache_size(maxsize: int) -> None:
+    _fields.maxsize = maxsize
+    _fields.trim()
+
+
+def clear_distance_cache() -> None:
+    _fields.clear()
+
+
+class PathMap(Mapping[Point, "list[Direction] | None"]):
+    """Paths from one source, each reconstructed when first looked up"""
+
+    def __init__(self, field: DistanceField, targets: Iterable[Point]) -> None:
+        self.field = field
+        self.targets = list(dict.fromkeys(targets))
+        self._wanted = set(self.targets)
+        self._paths: dict[Point, list[Direction] | None] = {}
+
+    def __getitem__(self, target: Point) -> list[Direction] | None:
+        if target not in self._wanted:
+            raise KeyError(target)
+        if target not in self._paths:
+            self._paths[target] = self.field.path(target)
+        return self._paths[target]
+
+    def __iter__(self) -> Iterator[Point]:
+        return iter(self.targets)
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def distance(self, target: Point) -> int | None:
+        return self.field.distance(target)
+
+
+def solve_many(
+    maze: Maze,
+    source: Point,
+    targets: Iterable[Point],
+) -> PathMap:
+    """
+    Shortest paths from source to every target out of one (cached) BFS.
+    Unreachable targets map to None.
+    """
+    return PathMap(distance_field(maze, source), targets)
+
+
+# bit -> opposite bit, and conn byte -> 1 for two-way corridor cells
+_OPP = bytes(((b << 2) | (b >> 2)) & 0xF for b in range(16))
+_SLOT = {1: 0, 2: 1, 4: 2, 8: 3}
+_CORRIDOR = bytes(int(bin(c & 0xF).count("1") == 2) for c in range(256))
+
+
+def _connections(maze: Maze) -> bytearray:
+    """
+    Like open_directions, but a bit is only kept when the neighbour is
+    open back as well. The four neighbour checks are done on the whole
+    grid at once as big-int masks (one byte per cell), which is much
+    faster than a per-cell loop on large grids.
+    """
+    n = maze.width * maze.height
+    row = 8 * maze.width
+    mask = int.from_bytes(open_directions(maze), "little")
+
+    def bits(b: int) -> int:
+        return mask & int.from_bytes(bytes([b]) * n, "little")
+
+    east = bits(Direction.EAST) & (bits(Direction.WEST) >> 8 >> 2)
+    south = bits(Direction.SOUTH) & (bits(Direction.NORTH) >> row << 2)
+    both = east | (east << 10) | south | (south << (row - 2))
+    return bytearray(both.to_bytes(n + maze.width + 1, "little")[:n])
+
+
+class JunctionGraph:
+    """
+    The maze with every corridor (run of cells with exactly two open
+    sides) contracted into one weighted edge between its end cells.
+
+    Nodes are junctions and dead ends. The edge leaving node k through
+    direction 1 << d is slot 4k + d of target (node id, -1 if none) and
+    length. Two spare nodes at the end stand in for a start and an end
+    that lie inside a corridor. A path found on the graph is expanded
+    back to cells by walking each corridor again.
+    """
+
+    __slots__ = (
+        "width", "conn", "corridor", "step", "ids", "nodes",
+        "target", "length",
+    )
+
+    def __init__(self, maze: Maze) -> None:
+        width = maze.width
+        conn = _connections(maze)
+        corridor = conn.translate(_CORRIDOR)
+        step = [0] * 9
+        for d in Direction:
+            step[d] = d.delta[1] * width + d.delta[0]
+        nodes = array("i", (
+            i for i, c in enumerate(conn) if c and not corridor[i]
+        ))
+        ids = array("i", [-1]) * len(conn)
+        for k, i in enumerate(nodes):
+            ids[i] = k
+        slots = 4 * (len(nodes) + 2)
+        target = array("i", [-1]) * slots
+        length = array("i", [0]) * slots
+        self.width = width
+        self.conn = conn
+        self.corridor = corridor
+        self.step = step
+        self.ids = ids
+        self.nodes = nodes
+
+        for k, i in enumerate(nodes):
+            c = conn[i]
+            for side in range(4):
+                slot = 4 * k + side
+                if not c & (1 << side) or target[slot] >= 0:
+                    continue                # walked from the far end
+                j, steps, last = self._walk(i, 1 << side, -1)
+                back = 4 * ids[j] + _SLOT[_OPP[last]]
+                target[slot] = ids[j]
+                length[slot] = steps
+                target[back] = k
+                length[back] = steps
+        self.target = target
+        self.length = length
+
+    def _walk(self, i: int, bit: int, stop: int) -> tuple[int, int, int]:
+        """
+        Follow the corridor leaving cell i through bit up to the next node
+        or cell stop: (end cell, steps, bit of the last step). A corridor
+        that loops back to i without meeting either ends at i.
+        """
+        conn, corridor, step = self.conn, self.corridor, self.step
+        origin = i
+        steps = 0
+        while True:
+            i += step[bit]
+            steps += 1
+            if not corridor[i] or i == stop or i == origin:
+                return i, steps, bit
+            bit = conn[i] & ~_OPP[bit]
+
+    def _expand(
+        self,
+        i: int,
+        bit: int,
+        stop: int,
+        out: list[Direction],
+    ) -> None:
+        conn, corridor, step = self.conn, self.corridor, self.step
+        while True:
+            out.append(_BY_BIT[bit])
+            i += step[bit]
+            if not corridor[i] or i == stop:
+                return
+            bit = conn[i] & ~_OPP[bit]
+
+    def path(self, start: Point, end: Point) -> list[Direction] | None:
+        """
+        A* over the nodes. Edge weights are small ints, so the open set
+        is a dict of buckets keyed by f rather than a heap.
+        """
+        width = self.width
+        s = start[1] * width + start[0]
+        e = end[1] * width + end[0]
+        if s == e:
+            return []
+        ids, nodes = self.ids, self.nodes
+        target, length = self.target, self.length
+        n = len(nodes)
+        si = ids[s] if ids[s] >= 0 else n
+        ei = ids[e] if ids[e] >= 0 else n + 1
+
+        # Splice a corridor start or end in for this query only: start's
+        # slots lead to the two ends of its corridor (or straight to end),
+        # and the slots leading into end's corridor are cut short at end.
+        # A shortest path never goes on past end, so that loses nothing.
+        patched: list[tuple[int, int, int]] = []
+        try:
+            if si == n:
+                c = self.conn[s]
+                for d in range(4):
+                    if c & (1 << d):
+                        j, steps, _ = self._walk(s, 1 << d, e)
+                        if j != s:
+                            self._patch(patched, 4 * n + d,
+                                        ei if j == e else ids[j], steps)
+            if ei == n + 1:
+                c = self.conn[e]
+                for d in range(4):
+                    if c & (1 << d):
+                        j, steps, last = self._walk(e, 1 << d, s)
+                        if j != e and not (j == s and si == n):
+                            k = si if j == s else ids[j]
+                            self._patch(patched, 4 * k + _SLOT[_OPP[last]],
+                                        ei, steps)
+            return self._search(start, end, si, ei, e)
+        finally:
+            for slot, old_target, old_length in reversed(patched):
+                target[slot] = old_target
+                length[slot] = old_length
+
+    def _patch(
+        self,
+        patched: list[tuple[int, int, int]],
+        slot: int,
+        node: int,
+        steps: int,
+    ) -> None:
+        patched.append((slot, self.target[slot], self.length[slot]))
+        self.target[slot] = node
+        self.length[slot] = steps
+
+    def _search(
+        self,
+        start: Point,
+        end: Point,
+        si: int,
+        ei: int,
+        e: int,
+    ) -> list[Direction] | None:
+        width = self.width
+        ex, ey = end
+        nodes = self.nodes
+        target, length = self.target, self.length
+        n = len(nodes)
+        cells = {n: start[1] * width + start[0], n + 1: e}
+
+        best = array("i", [-1]) * (n + 2)
+        h = array("i", [0]) * (n + 2)
+        prev = array("i", [-1]) * (n + 2)
+        best[si] = 0
+        h[si] = abs(start[0] - ex) + abs(start[1] - ey)
+        f = top = h[si]
+        buckets: dict[int, list[int]] = {f: [si]}
+        while f <= top:
+            bucket = buckets.pop(f, None)
+            while bucket:
+                k = bucket.pop()
+                g = best[k]
+                if g + h[k] != f:
+                    continue            # improved since it was queued
+                if k == ei:
+                    return self._unroll(prev, cells, si, ei, e)
+                for slot in range(4 * k, 4 * k + 4):
+                    j = target[slot]
+                    if j < 0:
+                        continue
+                    gj = g + length[slot]
+                    old = best[j]
+                    if old < 0 or gj < old:
+                        if old < 0:
+                            c = nodes[j] if j < n else cells[j]
+                            h[j] = abs(c % width - ex) + abs(c // width - ey)
+                        best[j] = gj
+                        prev[j] = slot
+                        fj = gj + h[j]
+                        if fj == f:
+                            bucket.append(j)
+                        else:
+                            buckets.setdefault(fj, []).append(j)
+                            top = max(top, fj)
+            f += 1
+        return None
+
+    def _unroll(
+        self,
+        prev: array[int],
+        cells: dict[int, int],
+        si: int,
+        ei: int,
+        e: int,
+    ) -> list[Direction]:
+        nodes = self.nodes
+        n = len(nodes)
+        legs = []
+        k = ei
+        while k != si:
+            slot = prev[k]
+            legs.append(slot)
+            k = slot // 4
+        path: list[Direction] = []
+        for slot in reversed(legs):
+            k = slot // 4
+            self._expand(nodes[k] if k < n else cells[k], 1 << (slot & 3),
+                         e, path)
+        return path
+
+
+_junction_graphs = _MazeCache(JunctionGraph, maxsize=2)
+
+
+def junction_graph(maze: Maze) -> JunctionGraph:
+    """Junction graph of the maze, reused until the maze is touch()ed"""
+    return _junction_graphs.get(maze)
+
+
+def _junctions(
+    maze: Maze,
+    start: Point,
+    end: Point,
+) -> list[Direction] | None:
+    return junction_graph(maze).path(start, end)
+
+
+SOLVERS: dict[str, Callable[[Maze, Point, Point], list[Direction] | None]] = {
+    "bfs": _bfs,
+    "astar": _astar,
+    "bidirectional": _bidirectional,
+    "junctions": _junctions,
+}
+
+
+# Clockwise order used by the wall follower
+_CLOCKWISE = (Direction.NORTH, Direction.EAST, Direction.SOUTH, Direction.WEST)
+
+
+def walk_tree_path(
+    cell_at: Callable[[int, int], int],
+    width: int,
+    height: int,
+    start: Point,
+    end: Point,
+) -> list[Direction] | None:
+    """
+    Path between two cells of a perfect maze by left-hand wall following.
+
+    Cells are only read through cell_at, and memory is the path itself,
+    so this works on mazes that are not loaded (e.g. an mmapped file).
+    Without loops the walk is a depth-first tour, and cancelling every
+    step that undoes the previous one leaves the unique path. Returns
+    None if end is not reachable.
+    """
+    if start == end:
+        return []
+    x, y = start
+    heading = 0
+    first_move: int | None = None
+    stack = bytearray()
+    while True:
+        cell = cell_at(x, y)
+        for turn in (3, 0, 1, 2):       # left, straight, right, back
+            d = (heading + turn) % 4
+            if not cell & _CLOCKWISE[d]:
+                dx, dy = _CLOCKWISE[d].delta
+                if in_bounds(x + dx, y + dy, width, height):
+                    break
+        else:
+            return None                 # closed cell
+        if (x, y) == start:
+            if first_move is None:
+                first_move = d
+            elif d == first_move:
+                return None             # toured the whole component
+        if stack and stack[-1] == (d + 2) % 4:
+            stack.pop()
+        else:
+            stack.append(d)
+        heading = d
+        x, y = x + dx, y + dy
+        if (x, y) == end:
+            return [_CLOCKWISE[d] for d in stack]
+
+
 def path_to_str(path: Sequence[Direction]) -> str:
     """Convert a list of Direction to the compact N/E/S/W string."""
     return "".join(str(d) for d in path)
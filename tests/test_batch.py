@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import gzip
+import os
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from batch import run_batch
+from utils import Config
+
+
+def _config(output_file: str) -> Config:
+    return Config(
+        width=9, height=7, entry=(0, 0), exit=(8, 6), perfect=True,
+        show_path=False, seed=None, output_file=output_file,
+    )
+
+
+def _check_maze_text(text: str) -> None:
+    rows = text.splitlines()[:7]
+    assert all(len(row) == 9 for row in rows)
+    assert set("".join(rows)) <= set("0123456789ABCDEF")
+
+
+def test_directory_keeps_compression(tmp_path: Path) -> None:
+    cfg = _config("maze_output.txt.gz")
+    out = tmp_path / "mazes"
+    assert run_batch(cfg, range(3, 5), 1, str(out)) == 2
+    assert sorted(os.listdir(out)) == [
+        "maze_output_3.txt.gz", "maze_output_4.txt.gz",
+    ]
+    with gzip.open(out / "maze_output_3.txt.gz", "rt") as f:
+        _check_maze_text(f.read())
+
+
+@pytest.mark.parametrize("archive", ["mazes.zip", "mazes.tar.gz"])
+def test_archive_members_are_plain_text(tmp_path: Path, archive: str) -> None:
+    cfg = _config("maze_output.txt.gz")
+    out = str(tmp_path / archive)
+    run_batch(cfg, range(3, 5), 1, out)
+    if archive.endswith(".zip"):
+        with zipfile.ZipFile(out) as zf:
+            names = zf.namelist()
+            text = zf.read("maze_output_3.txt").decode()
+    else:
+        with tarfile.open(out) as tf:
+            names = tf.getnames()
+            member = tf.extractfile("maze_output_3.txt")
+            assert member is not None
+            text = member.read().decode()
+    assert names == ["maze_output_3.txt", "maze_output_4.txt"]
+    _check_maze_text(text)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+from generator import generate_maze
+from hierarchy import HierarchyIndex
+from maze import maze_text
+from solution import solve
+from utils import Config, Maze
+
+logger = logging.getLogger(__name__)
+
+
+def _config(perfect: bool, seed: int) -> Config:
+    return Config(
+        width=80, height=60, entry=(0, 0), exit=(79, 59),
+        perfect=perfect, show_path=False, seed=seed,
+        solver="hierarchical",
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_dumped_path_is_shortest_on_perfect_mazes(seed: int) -> None:
+    # kruskal keeps no parent links, so the path really comes from HPA*
+    cfg = _config(True, seed)
+    cfg.algorithm = "kruskal"
+    path = maze_text(cfg, logger).splitlines()[-1]
+    maze = generate_maze(80, 60, (0, 0), (79, 59), True, seed, "kruskal")
+    shortest = solve(maze, (0, 0), (79, 59))
+    assert shortest is not None
+    assert len(path) == len(shortest)
+
+
+def test_non_perfect_mazes_are_rejected() -> None:
+    # HPA* paths through loops can be longer than solve()'s
+    with pytest.raises(ValueError, match="PERFECT=True"):
+        maze_text(_config(False, 1), logger)
+
+
+def test_one_cell_wide_maze() -> None:
+    # one column open from north to south: EAST | WEST walls throughout
+    rows = [[11]] + [[10]] * 38 + [[14]]
+    maze = Maze.from_rows(rows)
+    index = HierarchyIndex.build(maze, cluster=4)
+    path = index.path(maze, (0, 0), (0, 39))
+    assert path is not None and len(path) == 39
+    assert path == solve(maze, (0, 0), (0, 39))
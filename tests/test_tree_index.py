@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from generator import generate_maze
+from solution import solve
+from tree_index import TreeIndex
+from utils import CLOSED_CELL, Maze
+
+
+def test_paths_match_solve() -> None:
+    maze = generate_maze(30, 20, (0, 0), (29, 19), perfect=True, seed=3)
+    index = TreeIndex(maze)
+    for a, b in [((0, 0), (29, 19)), ((5, 17), (22, 1)), ((13, 4), (2, 9))]:
+        path = solve(maze, a, b)
+        assert path is not None
+        assert index.path(a, b) == path
+        assert index.distance(a, b) == len(path)
+
+
+def test_same_cell_gives_empty_path() -> None:
+    maze = generate_maze(30, 20, (0, 0), (29, 19), perfect=True, seed=3)
+    index = TreeIndex(maze)
+    closed = maze.cells.index(int(CLOSED_CELL))   # one of the 42 cells
+    cell = (closed % maze.width, closed // maze.width)
+    for point in [(4, 4), cell]:
+        assert solve(maze, point, point) == []
+        assert index.path(point, point) == []
+        assert index.distance(point, point) == 0
+
+
+def test_unconnected_cell_gives_none() -> None:
+    maze = Maze(3, 1, fill=int(CLOSED_CELL))
+    index = TreeIndex(maze)
+    assert index.path((0, 0), (2, 0)) is None
+    assert index.distance((0, 0), (2, 0)) is None
@@ -0,0 +1,404 @@
+from __future__ import annotations
+
+import io
+import random
+import struct
+from collections import OrderedDict
+from typing import Iterator
+
+from generator import (
+    _add_extra_passages,
+    _backtracking,
+    _find_42_position,
+    _pattern_42_cells,
+    _validate_points,
+    get_carver,
+)
+from solution import solve
+from utils import CLOSED_CELL, Direction, Maze, Point
+
+TILE = 256
+CACHE_TILES = 256
+
+_MAGIC = b"AMZT"
+VERSION = 1
+# magic, version, width, height, tile size; tiles start at _DATA, one
+# tile * tile block each (edge tiles padded), tile rows in order
+_HEADER = struct.Struct("<4sH3I")
+_DATA = 4096
+
+_E = int(Direction.EAST)
+_S = int(Direction.SOUTH)
+_W = int(Direction.WEST)
+_N = int(Direction.NORTH)
+
+
+class _TiledCells:
+    """
+    maze.cells for a TiledMaze: one int per linear cell index. Only single
+    cells can be read or written; there is no slicing or translate().
+    """
+
+    __slots__ = ("_maze",)
+
+    def __init__(self, maze: TiledMaze) -> None:
+        self._maze = maze
+
+    def __len__(self) -> int:
+        return self._maze.width * self._maze.height
+
+    def __getitem__(self, i: int) -> int:
+        m = self._maze
+        y, x = divmod(i, m.width)
+        t, k = m._locate(x, y)
+        return m._tile(t)[k]
+
+    def __setitem__(self, i: int, value: int) -> None:
+        m = self._maze
+        y, x = divmod(i, m.width)
+        t, k = m._locate(x, y)
+        m._tile(t)[k] = value
+        m._dirty.add(t)
+
+
+class TiledMaze:
+    """
+    A maze grid kept in a file as square tiles, for mazes that do not fit
+    in memory.
+
+    Only the most recently used tiles (cache_tiles of them) are held in
+    memory; changed tiles are written back when they are evicted or on
+    flush(). width, height and cells[i] behave as on Maze for single
+    cells, but whole-grid operations (slicing, translate) are missing, so
+    the solvers and renderers do not accept a TiledMaze. Find paths with
+    tiled_path, which solves one tile at a time, or use get_tile() or
+    to_maze() for a plain Maze. rows() streams the grid in order for
+    writing it out. Use as a context manager, or call close().
+    """
+
+    __slots__ = ("width", "height", "tile", "cols", "cells",
+                 "_f", "_cache", "_dirty", "_cache_tiles")
+
+    def __init__(self, filename: str, cache_tiles: int = CACHE_TILES,
+                 writable: bool = False) -> None:
+        self._f: io.BufferedRandom | io.BufferedReader = (
+            open(filename, "r+b") if writable else open(filename, "rb")
+        )
+        header = self._f.read(_HEADER.size)
+        if len(header) != _HEADER.size or header[:4] != _MAGIC:
+            self._f.close()
+            raise ValueError(f"{filename} is not a tiled maze file")
+        _, version, width, height, tile = _HEADER.unpack(header)
+        if version != VERSION:
+            self._f.close()
+            raise ValueError(
+                f"Unsupported tiled maze version {version} in {filename}"
+            )
+        self._setup(width, height, tile, cache_tiles)
+
+    def _setup(self, width: int, height: int, tile: int,
+               cache_tiles: int) -> None:
+        if cache_tiles < 1:
+            raise ValueError("The tile cache needs room for one tile")
+        self.width = width
+        self.height = height
+        self.tile = tile
+        self.cols = -(-width // tile)
+        self.cells = _TiledCells(self)
+        self._cache: OrderedDict[int, bytearray] = OrderedDict()
+        self._dirty: set[int] = set()
+        self._cache_tiles = cache_tiles
+
+    @classmethod
+    def create(
+        cls,
+        filename: str,
+        width: int,
+        height: int,
+        tile: int = TILE,
+        fill: int = 0,
+        cache_tiles: int = CACHE_TILES,
+    ) -> TiledMaze:
+        """A new tiled maze file with every cell set to fill"""
+        if width < 1 or height < 1:
+            raise ValueError("Maze is empty")
+        if tile < 1:
+            raise ValueError("Tile size must be positive")
+        maze = cls.__new__(cls)
+        maze._f = open(filename, "w+b")
+        maze._setup(width, height, tile, cache_tiles)
+        maze._f.write(_HEADER.pack(_MAGIC, VERSION, width, height, tile))
+        count = maze.cols * -(-height // tile)
+        maze._f.truncate(_DATA + count * tile * tile)  # sparse where it can
+        if fill:
+            block = bytes([fill]) * (tile * tile)
+            for t in range(count):
+                maze._write_tile(t, block)
+        return maze
+
+    def _locate(self, x: int, y: int) -> tuple[int, int]:
+        """(tile number, offset in the tile) of cell (x, y)"""
+        size = self.tile
+        ty, ry = divmod(y, size)
+        tx, rx = divmod(x, size)
+        return ty * self.cols + tx, ry * size + rx
+
+    def _tile(self, t: int) -> bytearray:
+        cache = self._cache
+        data = cache.get(t)
+        if data is not None:
+            cache.move_to_end(t)
+            return data
+        if len(cache) >= self._cache_tiles:
+            old, old_data = cache.popitem(last=False)
+            if old in self._dirty:
+                self._dirty.discard(old)
+                self._write_tile(old, old_data)
+        size = self.tile * self.tile
+        data = bytearray(size)
+        self._f.seek(_DATA + t * size)
+        self._f.readinto(data)
+        cache[t] = data
+        return data
+
+    def _write_tile(self, t: int, data: bytes | bytearray) -> None:
+        self._f.seek(_DATA + t * len(data))
+        self._f.write(data)
+
+    def put_tile(self, tx: int, ty: int, cells: bytes | bytearray) -> None:
+        """
+        Replace tile (tx, ty) with a row-major grid of its cells (edge
+        tiles are narrower or shorter than tile).
+        """
+        size = self.tile
+        tw = min(size, self.width - tx * size)
+        th = min(size, self.height - ty * size)
+        if len(cells) != tw * th:
+            raise ValueError(f"Tile ({tx},{ty}) needs {tw * th} cells")
+        t = ty * self.cols + tx
+        data = bytearray(size * size)
+        for r in range(th):
+            data[r * size:r * size + tw] = cells[r * tw:(r + 1) * tw]
+        self._cache.pop(t, None)
+        self._dirty.discard(t)
+        self._write_tile(t, data)
+
+    def get_tile(self, tx: int, ty: int) -> Maze:
+        """Tile (tx, ty) as a standalone Maze"""
+        size = self.tile
+        tw = min(size, self.width - tx * size)
+        th = min(size, self.height - ty * size)
+        data = self._tile(ty * self.cols + tx)
+        cells = bytearray()
+        for r in range(th):
+            cells += data[r * size:r * size + tw]
+        return Maze(tw, th, cells=cells)
+
+    def cell(self, x: int, y: int) -> int:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"Cell ({x},{y}) is outside the maze")
+        t, k = self._locate(x, y)
+        return self._tile(t)[k]
+
+    def rows(self) -> Iterator[bytes]:
+        """
+        Grid rows in order, one byte per cell. One band of tiles is read
+        at a time, so memory is about width * tile bytes.
+        """
+        self.flush()
+        size = self.tile
+        block = size * size
+        for ty in range(-(-self.height // size)):
+            self._f.seek(_DATA + ty * self.cols * block)
+            band = self._f.read(self.cols * block)
+            tiles = [band[t * block:(t + 1) * block]
+                     for t in range(self.cols)]
+            for r in range(min(size, self.height - ty * size)):
+                row = b"".join(data[r * size:(r + 1) * size]
+                               for data in tiles)
+                yield row[:self.width]
+
+    def to_maze(self) -> Maze:
+        cells = bytearray()
+        for row in self.rows():
+            cells += row
+        return Maze(self.width, self.height, cells=cells)
+
+    def flush(self) -> None:
+        for t in sorted(self._dirty):
+            self._write_tile(t, self._cache[t])
+        self._dirty.clear()
+        self._f.flush()
+
+    def close(self) -> None:
+        if not self._f.closed:
+            if self._f.writable():
+                self.flush()
+            self._f.close()
+        self._cache.clear()
+
+    def __enter__(self) -> TiledMaze:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _tile_rng(base: int, t: int) -> random.Random:
+    # Every tile has its own stream, so a tile does not depend on the
+    # order (or the process) the tiles are carved in
+    return random.Random(f"{base}/{t}")
+
+
+def generate_tiled(
+    filename: str,
+    width: int,
+    height: int,
+    entry: Point,
+    exit_: Point,
+    perfect: bool = True,
+    seed: int | None = None,
+    algorithm: str = "backtracking",
+    tile: int = TILE,
+    version: int = 1,
+) -> tuple[TiledMaze, Maze]:
+    """
+    Generate a maze into a tiled file, one tile in memory at a time.
+
+    Each tile is carved on its own as a perfect maze. The tiles are then
+    joined along a random spanning tree of the tile grid (the returned
+    layout: one cell per tile, an open wall per joined seam) with a
+    single opening per joined seam, so the whole maze is connected and,
+    with perfect=True, still perfect. The "42" pattern goes in the tile
+    holding the maze centre when it fits there.
+    """
+    _validate_points(width, height, entry, exit_)
+    carve = get_carver(algorithm, version)
+    if tile < 2:
+        raise ValueError("Tile size must be at least 2")
+    rng = random.Random(seed)
+    base = rng.getrandbits(64)
+    cols = -(-width // tile)
+    rows = -(-height // tile)
+
+    layout = Maze(cols, rows, fill=int(CLOSED_CELL))
+    _backtracking(layout, cols, rows, (0, 0), set(), rng)
+    # Seam openings: east_at[t] is the row of the opening between tile t
+    # and the next one east, south_at[t] the column of the one below
+    east_at = [rng.randrange(min(tile, height - t // cols * tile))
+               for t in range(cols * rows)]
+    south_at = [rng.randrange(min(tile, width - t % cols * tile))
+                for t in range(cols * rows)]
+
+    centre = (width // 2 // tile, height // 2 // tile)
+    maze = TiledMaze.create(filename, width, height, tile)
+    try:
+        for ty in range(rows):
+            for tx in range(cols):
+                t = ty * cols + tx
+                tw = min(tile, width - tx * tile)
+                th = min(tile, height - ty * tile)
+                local = Maze(tw, th, fill=int(CLOSED_CELL))
+                tile_rng = _tile_rng(base, t)
+                blocked: set[Point] = set()
+                if (tx, ty) == centre:
+                    ox, oy = _find_42_position(
+                        tw, th,
+                        (entry[0] - tx * tile, entry[1] - ty * tile),
+                        (exit_[0] - tx * tile, exit_[1] - ty * tile),
+                        tile_rng,
+                    )
+                    if ox > -1 and oy > -1:
+                        blocked = _pattern_42_cells(ox, oy)
+                carve(local, tw, th, (0, 0), blocked, tile_rng)
+                if not perfect:
+                    _add_extra_passages(local, tw, th, blocked, tile_rng)
+                _open_seams(local, layout.cells, t, cols, east_at, south_at)
+                maze.put_tile(tx, ty, local.cells)
+    except BaseException:
+        maze.close()
+        raise
+    return maze, layout
+
+
+def _open_seams(
+    local: Maze,
+    links: bytearray,
+    t: int,
+    cols: int,
+    east_at: list[int],
+    south_at: list[int],
+) -> None:
+    """Open this tile's side of each of its joined seams"""
+    cells, tw, th = local.cells, local.width, local.height
+    link = links[t]
+    if not link & _E:
+        cells[east_at[t] * tw + tw - 1] &= ~_E
+    if not link & _S:
+        cells[(th - 1) * tw + south_at[t]] &= ~_S
+    if not link & _W:
+        cells[east_at[t - 1] * tw] &= ~_W
+    if not link & _N:
+        cells[south_at[t - cols]] &= ~_N
+
+
+def tiled_path(
+    maze: TiledMaze,
+    layout: Maze,
+    start: Point,
+    end: Point,
+    solver: str = "bfs",
+) -> Iterator[list[Direction]] | None:
+    """
+    Path from start to end in a maze made by generate_tiled, as one list
+    of steps per tile it crosses, or None if there is none.
+
+    The tiles to cross are fixed by the layout, and within each tile the
+    path cannot leave it, so only one tile is solved at a time.
+    """
+    size = maze.tile
+    tiles = solve(
+        layout, (start[0] // size, start[1] // size),
+        (end[0] // size, end[1] // size), solver,
+    )
+    if tiles is None:
+        return None
+
+    def legs(route: list[Direction]) -> Iterator[list[Direction]]:
+        tx, ty = start[0] // size, start[1] // size
+        x, y = start[0] - tx * size, start[1] - ty * size
+        for d in [*route, None]:
+            local = maze.get_tile(tx, ty)
+            if d is None:
+                target = (end[0] - tx * size, end[1] - ty * size)
+            else:
+                target = _seam_cell(local, d)
+            leg = solve(local, (x, y), target, solver)
+            if leg is None:
+                raise ValueError(f"Tile ({tx},{ty}) is not connected")
+            if d is not None:
+                leg.append(d)
+                dx, dy = d.delta
+                tx, ty = tx + dx, ty + dy
+                x, y = target[0] + dx, target[1] + dy
+                x = x % size if dx else x
+                y = y % size if dy else y
+            yield leg
+
+    return legs(tiles)
+
+
+def _seam_cell(local: Maze, d: Direction) -> Point:
+    """The cell with the open wall on side d of a tile"""
+    w, h = local.width, local.height
+    cells, bit = local.cells, int(d)
+    if d in (Direction.EAST, Direction.WEST):
+        x = w - 1 if d == Direction.EAST else 0
+        points = [(x, y) for y in range(h)]
+    else:
+        y = h - 1 if d == Direction.SOUTH else 0
+        points = [(x, y) for x in range(w)]
+    for x, y in points:
+        if not cells[y * w + x] & bit:
+            return x, y
+    raise ValueError(f"No opening on the {d} side of a tile")
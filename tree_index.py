@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from array import array
+
+from solution import _BY_BIT, _steps, open_directions
+from utils import CLOSED_CELL, ROOT, Direction, Maze, Point
+
+
+class TreeIndex:
+    """
+    Rooted spanning tree of a perfect maze for repeated path queries.
+
+    Built with one BFS; afterwards distance() costs O(log n) and path()
+    O(path length), with no search. Ancestors are found through one
+    skew-binary jump pointer per cell (Myers' jump pointers), which
+    gives the same O(log n) bound as binary lifting with 4 bytes per
+    cell instead of 4 * log2(n).
+
+    Only the component of the first open cell is indexed; queries that
+    involve any other cell return None, except start == end, which gives
+    [] (distance 0) as solve() does.
+    """
+
+    __slots__ = ("width", "parent", "depth", "jump", "came_from")
+
+    def __init__(self, maze: Maze) -> None:
+        width = maze.width
+        n = width * maze.height
+        mask = open_directions(maze)
+        steps = _steps(width)
+        parent = array("i", [-1]) * n
+        depth = array("i", [-1]) * n
+        jump = array("i", [-1]) * n
+        came_from = bytearray(n)
+
+        root = next(
+            (i for i, c in enumerate(maze.cells) if c != CLOSED_CELL), 0
+        )
+        came_from[root] = ROOT
+        depth[root] = 0
+        jump[root] = root
+        parent[root] = root
+        order = [root]
+        edges = 0
+        for i in order:                 # BFS: parents come before children
+            m = mask[i]
+            d = depth[i] + 1
+            p = jump[i]
+            # Skew-binary rule: jump twice as far when the two jumps above
+            # are the same length, else jump to the parent
+            if depth[i] - depth[p] == depth[p] - depth[jump[p]]:
+                child_jump = jump[p]
+            else:
+                child_jump = i
+            for bit, step, back, _, _ in steps:
+                if m & bit and mask[i + step] & back:
+                    edges += 1
+                    j = i + step
+                    if not came_from[j]:
+                        came_from[j] = bit
+                        parent[j] = i
+                        depth[j] = d
+                        jump[j] = child_jump
+                        order.append(j)
+        if edges // 2 != len(order) - 1:
+            raise ValueError(
+                "Maze has loops, a tree index needs PERFECT=True"
+            )
+        self.width = width
+        self.parent = parent
+        self.depth = depth
+        self.jump = jump
+        self.came_from = came_from
+
+    def _ancestor(self, i: int, level: int) -> int:
+        depth, jump = self.depth, self.jump
+        while depth[i] > level:
+            i = jump[i] if depth[jump[i]] >= level else self.parent[i]
+        return i
+
+    def _lca(self, u: int, v: int) -> int:
+        depth, jump, parent = self.depth, self.jump, self.parent
+        if depth[u] < depth[v]:
+            u, v = v, u
+        u = self._ancestor(u, depth[v])
+        # u and v are at the same depth, so are their jump targets
+        while u != v:
+            if jump[u] != jump[v]:
+                u, v = jump[u], jump[v]
+            else:
+                u, v = parent[u], parent[v]
+        return u
+
+    def _cells(self, a: Point, b: Point) -> tuple[int, int] | None:
+        u = a[1] * self.width + a[0]
+        v = b[1] * self.width + b[0]
+        if self.depth[u] < 0 or self.depth[v] < 0:
+            return None
+        return u, v
+
+    def distance(self, start: Point, end: Point) -> int | None:
+        """Number of steps between two cells, or None if not connected"""
+        if start == end:
+            return 0
+        cells = self._cells(start, end)
+        if cells is None:
+            return None
+        u, v = cells
+        depth = self.depth
+        return depth[u] + depth[v] - 2 * depth[self._lca(u, v)]
+
+    def path(self, start: Point, end: Point) -> list[Direction] | None:
+        """The unique path from start to end, or None if not connected"""
+        if start == end:
+            return []
+        cells = self._cells(start, end)
+        if cells is None:
+            return None
+        u, v = cells
+        top = self._lca(u, v)
+        parent, came_from = self.parent, self.came_from
+        up: list[Direction] = []
+        while u != top:
+            up.append(_BY_BIT[came_from[u]].opposite)
+            u = parent[u]
+        down: list[Direction] = []
+        while v != top:
+            down.append(_BY_BIT[came_from[v]])
+            v = parent[v]
+        down.reverse()
+        return up + down
@@ -1,9 +1,15 @@
 from __future__ import annotations
 import logging
+import shutil
+import sys
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import accumulate, groupby
 
 from maze import make_maze
-from typing import Sequence
-from utils import Color, Maze, Point, Direction, CLOSED_CELL
+from typing import Iterator, Sequence, TextIO
+from utils import Color, Config, Maze, Point, Direction, CLOSED_CELL
 
 
 def _fg(r: int, g: int, b: int) -> str:
@@ -16,6 +22,209 @@ def _bg(r: int, g: int, b: int) -> str:
 
 RESET = "\033[0m"
 
+# Rendered text goes to the terminal in writes of about this many chars
+_CHUNK = 1 << 16
+# Lines below the maze: view position, title, five options and the prompt
+_MENU_LINES = 8
+# Alternate screen buffer on/off, and cursor home plus clear screen
+_ALT_SCREEN_ON = "\033[?1049h"
+_ALT_SCREEN_OFF = "\033[?1049l"
+_CLEAR = "\033[H\033[2J"
+_SCROLL_KEYS = {"w": (0, -1), "a": (-1, 0), "s": (0, 1), "d": (1, 0)}
+
+
+# What a cell body shows, in order of precedence when a cell is several
+_PLAIN, _PATH, _ENTRY, _EXIT, _P42 = range(5)
+_MARKS = ("  ", "o ", "O ", "X ", "  ")
+_KIND_OF_CELL = bytes(_P42 if c == CLOSED_CELL else _PLAIN for c in range(256))
+_WEST_KEY = bytes(5 if c & Direction.WEST else 0 for c in range(256))
+
+
+class AsciiGlyphs:
+    """
+    The strings render_maze_ascii is built from, compiled once per palette.
+
+    A body line is drawn as a small state machine over styles (the wall
+    colour or one of the marker styles): a piece only carries an escape
+    when its visible characters need a different style than the one in
+    effect, so runs of one colour share a single escape. Spaces show in
+    any foreground colour, so only a background (the "42" cells) forces
+    a reset around them.
+    """
+
+    __slots__ = ("wall", "top", "bottom", "plain", "pieces", "ends",
+                 "styles")
+
+    def __init__(self, palette: tuple[int, int, int, int, int]) -> None:
+        """palette: wall, path, entry, exit and "42" colours"""
+        wall_rgb, path_rgb, entry_rgb, exit_rgb, p42_rgb = (
+            Color.hex_to_rgb(c) for c in palette
+        )
+        wall = _fg(*wall_rgb)
+        styles = (
+            wall, _fg(*path_rgb), _fg(*entry_rgb), _fg(*exit_rgb),
+            _bg(*p42_rgb),
+        )
+
+        def switch(state: int, style: int) -> str:
+            if state == style:
+                return ""
+            return (RESET if state == _P42 else "") + styles[style]
+
+        self.wall = wall
+        self.top = ["+--" if c & Direction.NORTH else "+  "
+                    for c in range(256)]
+        self.bottom = ["+--" if c & Direction.SOUTH else "+  "
+                       for c in range(256)]
+        # Rows without markers stay in the wall style throughout
+        self.plain = ["|  " if c & Direction.WEST else "   "
+                      for c in range(256)]
+        # pieces[state * 10 + west * 5 + kind] = (text, state after it)
+        self.pieces: list[tuple[str, int]] = []
+        for state in range(5):
+            for west in (False, True):
+                for kind in range(5):
+                    text = ""
+                    now = state
+                    if west or now == _P42:
+                        text += switch(now, _PLAIN)
+                        now = _PLAIN
+                    text += "|" if west else " "
+                    if kind != _PLAIN or now == _P42:
+                        text += switch(now, kind)
+                        now = kind
+                    self.pieces.append((text + _MARKS[kind], now))
+        # ends[state * 2 + east]: right border after the last cell
+        self.styles = styles
+        self.ends = [
+            (switch(state, _PLAIN) if east or state == _P42 else "")
+            + ("|" if east else " ")
+            for state in range(5) for east in (False, True)
+        ]
+
+
+_glyphs = lru_cache(maxsize=8)(AsciiGlyphs)
+
+
+def glyphs_for(colors: Color) -> AsciiGlyphs:
+    return _glyphs(
+        (colors.wall, colors.path, colors.entry, colors.exit, colors.p42)
+    )
+
+
+# Sorted path cells of the last path drawn, reused while scrolling:
+# (path, start, width, cells)
+_path_cache: list[tuple[Sequence[Direction], Point, int, array[int]]] = []
+
+
+def _path_cells(
+    maze: Maze,
+    start: Point,
+    path: Sequence[Direction],
+) -> array[int]:
+    """Linear indices of the cells on path, sorted"""
+    width = maze.width
+    for cached, cached_start, cached_width, cells in _path_cache:
+        if cached is path and cached_start == start \
+                and cached_width == width:
+            return cells
+    offsets = {d: d.delta[1] * width + d.delta[0] for d in Direction}
+    walk = accumulate(
+        map(offsets.__getitem__, path), initial=start[1] * width + start[0]
+    )
+    n = width * maze.height
+    cells = array("q", sorted(i for i in walk if 0 <= i < n))
+    _path_cache[:] = [(path, start, width, cells)]
+    return cells
+
+
+def _view_marks(
+    maze: Maze,
+    view: tuple[int, int, int, int],
+    entry: Point | None,
+    exit_: Point | None,
+    path: Sequence[Direction] | None,
+) -> dict[int, dict[int, int]]:
+    """Markers inside view as {y: {x: kind}}"""
+    x0, y0, x1, y1 = view
+    width = maze.width
+    marks: dict[int, dict[int, int]] = {}
+    if path:
+        cells = _path_cells(maze, entry if entry else (0, 0), path)
+        for y in range(y0, y1):
+            base = y * width
+            lo = bisect_left(cells, base + x0)
+            hi = bisect_left(cells, base + x1, lo)
+            if lo < hi:
+                marks[y] = {i - base: _PATH for i in cells[lo:hi]}
+    for point, kind in ((exit_, _EXIT), (entry, _ENTRY)):
+        if point and x0 <= point[0] < x1 and y0 <= point[1] < y1:
+            marks.setdefault(point[1], {})[point[0]] = kind
+    return marks
+
+
+def _row_kinds(
+    row: bytearray,
+    marks: dict[int, int] | None,
+    x0: int,
+) -> bytearray:
+    """What each cell body of a row (starting at column x0) shows"""
+    kinds = row.translate(_KIND_OF_CELL)
+    if marks:
+        for x, kind in marks.items():
+            if kind != _PATH or kinds[x - x0] == _PLAIN:
+                kinds[x - x0] = kind
+    return kinds
+
+
+def iter_maze_lines(
+    maze: Maze,
+    colors: Color,
+    entry: Point | None = None,
+    exit_: Point | None = None,
+    path: Sequence[Direction] | None = None,
+    show_path: bool = True,
+    view: tuple[int, int, int, int] | None = None,
+) -> Iterator[str]:
+    """
+    The lines of render_maze_ascii one at a time, for the cells
+    x0 <= x < x1, y0 <= y < y1 of view = (x0, y0, x1, y1) (the whole
+    maze by default). Only the rows in view are read.
+    """
+    width = maze.width
+    x0, y0, x1, y1 = view or (0, 0, width, maze.height)
+    if not (0 <= x0 < x1 <= width and 0 <= y0 < y1 <= maze.height):
+        raise ValueError(f"View {view} is outside the maze")
+    cells = maze.cells
+    glyphs = glyphs_for(colors)
+    wall, top, plain = glyphs.wall, glyphs.top, glyphs.plain
+    pieces, ends = glyphs.pieces, glyphs.ends
+    marks = _view_marks(
+        maze, (x0, y0, x1, y1), entry, exit_, path if show_path else None
+    )
+    span = x1 - x0
+
+    for y in range(y0, y1):
+        base = y * width
+        row = cells[base + x0:base + x1]
+        yield wall + "".join(map(top.__getitem__, row)) + "+" + RESET
+        row_kinds = _row_kinds(row, marks.get(y), x0)
+        if row_kinds.count(_PLAIN) == span:
+            body = "".join(map(plain.__getitem__, row))
+            state = _PLAIN
+        else:
+            parts = []
+            state = _PLAIN
+            for key, kind in zip(row.translate(_WEST_KEY), row_kinds):
+                text, state = pieces[state * 10 + key + kind]
+                parts.append(text)
+            body = "".join(parts)
+        east = bool(row[-1] & Direction.EAST)
+        yield wall + body + ends[state * 2 + east] + RESET
+
+    row = cells[(y1 - 1) * width + x0:(y1 - 1) * width + x1]
+    yield wall + "".join(map(glyphs.bottom.__getitem__, row)) + "+" + RESET
+
 
 def render_maze_ascii(
     maze: Maze,
@@ -41,100 +250,407 @@ def render_maze_ascii(
       '## ' = '42' pattern cell
       'o ' = path cell
     """
+    return "\n".join(
+        iter_maze_lines(maze, colors, entry, exit_, path, show_path)
+    )
+
+
+def write_maze_ascii(
+    out: TextIO,
+    maze: Maze,
+    colors: Color,
+    entry: Point | None = None,
+    exit_: Point | None = None,
+    path: Sequence[Direction] | None = None,
+    show_path: bool = True,
+    view: tuple[int, int, int, int] | None = None,
+    unicode: bool = False,
+) -> None:
+    """
+    Write the rendered maze (or view) to out in chunks of ~64 KB, in the
+    ASCII layout or, with unicode=True, the half-block one.
+    """
+    render = iter_maze_lines_unicode if unicode else iter_maze_lines
+    chunk: list[str] = []
+    size = 0
+    for line in render(maze, colors, entry, exit_, path, show_path, view):
+        chunk.append(line)
+        size += len(line) + 1
+        if size >= _CHUNK:
+            out.write("\n".join(chunk) + "\n")
+            chunk.clear()
+            size = 0
+    if chunk:
+        out.write("\n".join(chunk) + "\n")
+    out.flush()
+
+
+# Half-block layout: the maze is a grid of blocks (corners, walls and
+# cells) and each character shows two of them stacked, a wall row block
+# on top and a cell row block below, in colour slots:
+_NONE, _WALL_SLOT = 0, 1
+# cell marker kind -> colour slot (path, entry, exit, "42" are 2-5)
+_KIND_SLOT = (_NONE, 2, 3, 4, 5)
+_SLOTS = 6
+_ANY = -1               # a space shows in any foreground colour
+_NORTH_BIT = bytes(1 if c & Direction.NORTH else 0 for c in range(256))
+_SOUTH_BIT = bytes(1 if c & Direction.SOUTH else 0 for c in range(256))
+_WEST_BIT = bytes(1 if c & Direction.WEST else 0 for c in range(256))
+
+
+class UnicodeGlyphs:
+    """
+    Half-block characters and colour escapes for DISPLAY=unicode,
+    compiled once per palette.
+
+    chars[top * _SLOTS + bottom] is (character, foreground slot,
+    background slot) for a top and a bottom block colour: a full or
+    half block in the foreground, the other half from the background.
+    """
+
+    __slots__ = ("fg", "bg", "chars")
+
+    def __init__(self, palette: tuple[int, int, int, int, int]) -> None:
+        rgb = [Color.hex_to_rgb(c) for c in palette]
+        self.fg = [""] + [_fg(*c) for c in rgb]
+        self.bg = ["\033[49m"] + [_bg(*c) for c in rgb]
+        self.chars: list[tuple[str, int, int]] = []
+        for top in range(_SLOTS):
+            for bottom in range(_SLOTS):
+                if top == bottom:
+                    glyph = ("█", top, _NONE) if top else (" ", _ANY, _NONE)
+                elif not bottom:
+                    glyph = ("▀", top, _NONE)
+                elif not top:
+                    glyph = ("▄", bottom, _NONE)
+                else:
+                    glyph = ("▀", top, bottom)
+                self.chars.append(glyph)
+
+    def restyle(
+        self,
+        state: tuple[int, int],
+        fg: int,
+        bg: int,
+    ) -> tuple[str, tuple[int, int]]:
+        """Escapes taking (fg, bg) state to what a character needs"""
+        now_fg, now_bg = state
+        escape = ""
+        if bg != now_bg:
+            escape += self.bg[bg]
+            now_bg = bg
+        if fg != _ANY and fg != now_fg:
+            escape += self.fg[fg]
+            now_fg = fg
+        return escape, (now_fg, now_bg)
 
-    height = len(maze)
-    width = len(maze[0])
-
-    path_cells: set[Point] = set()
-    if path and show_path:
-        px, py = entry if entry else (0, 0)
-        path_cells.add((px, py))
-        for d in path:
-            dx, dy = d.delta
-            px, py = px + dx, py + dy
-            path_cells.add((px, py))
-
-    closed: set[Point] = {
-        (x, y)
-        for y in range(height)
-        for x in range(width)
-        if maze[y][x] == int(CLOSED_CELL)
-    }
-
-    lines: list[str] = []
-
-    wall_fg = _fg(*Color.hex_to_rgb(colors.wall))
-
-    for y in range(height):
-        # top
-        top = ""
-        for x in range(width):
-            cell = maze[y][x]
-            top += wall_fg + "+" + RESET
-            if cell & Direction.NORTH:
-                top += wall_fg + "--" + RESET
-            else:
-                top += "  "
-        top += wall_fg + "+" + RESET
-        lines.append(top)
-        # row
-        row = ""
-        for x in range(width):
-            cell = maze[y][x]
-            # left wall
-            if cell & Direction.WEST:
-                row += wall_fg + "|" + RESET
-            else:
-                row += " "
-            # body
-            body = _cell_body(x, y, entry, exit_, path_cells, closed, colors)
-            row += body
-        # right wall of last cell
-        if maze[y][width - 1] & Direction.EAST:
-            row += wall_fg + "|" + RESET
-        else:
-            row += " "
-        lines.append(row)
-
-    # bottom
-    bottom = ""
-    for x in range(width):
-        cell = maze[height - 1][x]
-        bottom += wall_fg + "+" + RESET
-        if cell & Direction.SOUTH:
-            bottom += wall_fg + "--" + RESET
-        else:
-            bottom += "  "
-    bottom += wall_fg + "+" + RESET
-    lines.append(bottom)
 
-    return "\n".join(lines)
+_unicode_glyphs = lru_cache(maxsize=8)(UnicodeGlyphs)
 
 
-def _cell_body(
-    x: int,
+def unicode_glyphs_for(colors: Color) -> UnicodeGlyphs:
+    return _unicode_glyphs(
+        (colors.wall, colors.path, colors.entry, colors.exit, colors.p42)
+    )
+
+
+def _block_line(
+    maze: Maze,
     y: int,
-    entry: Point | None,
-    exit_: Point | None,
-    path_cells: set[Point],
-    closed: set[Point],
+    x0: int,
+    x1: int,
+    kinds: bytearray | None,
+) -> list[int]:
+    """
+    Glyph keys of output line y for cells x0 <= x < x1: corners and
+    north walls on top, west walls and cells below. Line maze.height is
+    the bottom border and has no cells.
+    """
+    w, h = maze.width, maze.height
+    cells = maze.cells
+
+    def walls_above(yy: int) -> bytes | bytearray:
+        # walls above cells x0 - 1 .. x1 of row yy (0 past the edges)
+        lo, hi = max(x0 - 1, 0), min(x1 + 1, w)
+        if yy < h:
+            row = cells[yy * w + lo:yy * w + hi].translate(_NORTH_BIT)
+        else:
+            row = cells[(h - 1) * w + lo:(h - 1) * w + hi] \
+                .translate(_SOUTH_BIT)
+        return bytes(lo - (x0 - 1)) + row + bytes(x1 + 1 - hi)
+
+    def walls_left(yy: int) -> bytes | bytearray:
+        # walls left of cells x0 .. x1 of row yy (x1 = w: the east border)
+        if not 0 <= yy < h:
+            return bytes(x1 - x0 + 1)
+        row = cells[yy * w + x0:yy * w + x1].translate(_WEST_BIT)
+        if x1 < w:
+            return row + bytes([cells[yy * w + x1] & Direction.WEST and 1])
+        return row + bytes([cells[yy * w + w - 1] & Direction.EAST and 1])
+
+    above = walls_above(y)
+    left = walls_left(y)
+    left_up = walls_left(y - 1)
+    corners = [
+        1 if a or b or c or d else 0
+        for a, b, c, d in zip(above, above[1:], left, left_up)
+    ]
+    if kinds is None:
+        left = bytes(len(left))     # below the view: corners only
+    keys = []
+    for i in range(x1 - x0):
+        keys.append(corners[i] * _SLOTS + left[i])
+        cell = _KIND_SLOT[kinds[i]] if kinds is not None else _NONE
+        keys.append(above[i + 1] * _SLOTS + cell)
+    keys.append(corners[-1] * _SLOTS + left[-1])
+    return keys
+
+
+def iter_maze_lines_unicode(
+    maze: Maze,
     colors: Color,
-) -> str:
-    if (x, y) == entry:
-        return _fg(*Color.hex_to_rgb(colors.entry)) + "O " + RESET
-    if (x, y) == exit_:
-        return _fg(*Color.hex_to_rgb(colors.exit)) + "X " + RESET
-    if (x, y) in closed:
-        return _bg(*Color.hex_to_rgb(colors.p42)) + "  " + RESET
-    if (x, y) in path_cells:
-        return _fg(*Color.hex_to_rgb(colors.path)) + "o " + RESET
-    return _fg(*Color.hex_to_rgb(colors.bg)) + "  " + RESET
-
-def _get_next_action() -> int:
-    inp: str = input("Choice? (1-4) ")
+    entry: Point | None = None,
+    exit_: Point | None = None,
+    path: Sequence[Direction] | None = None,
+    show_path: bool = True,
+    view: tuple[int, int, int, int] | None = None,
+) -> Iterator[str]:
+    """
+    Like iter_maze_lines, in the half-block layout: 2 characters per
+    cell and one line per row (plus one for the bottom border), against
+    3 characters and 2 lines in ASCII. Markers are shown as colour.
+    """
+    width = maze.width
+    x0, y0, x1, y1 = view or (0, 0, width, maze.height)
+    if not (0 <= x0 < x1 <= width and 0 <= y0 < y1 <= maze.height):
+        raise ValueError(f"View {view} is outside the maze")
+    glyphs = unicode_glyphs_for(colors)
+    chars = glyphs.chars
+    marks = _view_marks(
+        maze, (x0, y0, x1, y1), entry, exit_, path if show_path else None
+    )
+    for y in range(y0, y1 + 1):
+        kinds = None
+        if y < y1:
+            base = y * width
+            kinds = _row_kinds(maze.cells[base + x0:base + x1],
+                               marks.get(y), x0)
+        parts = []
+        state = (_NONE, _NONE)
+        for key, run in groupby(_block_line(maze, y, x0, x1, kinds)):
+            char, fg, bg = chars[key]
+            escape, state = glyphs.restyle(state, fg, bg)
+            parts.append(escape + char * len(list(run)))
+        if state != (_NONE, _NONE):
+            parts.append(RESET)
+        yield "".join(parts)
+
+
+def _move(line: int, col: int, to_line: int, to_col: int) -> str:
+    """Shortest cursor movement from (line, col) (0 = unknown) to a cell"""
+    jump = f"\033[{to_line};{to_col}H"
+    if not line:
+        return jump
+    if to_line == line:
+        vertical = ""
+    elif to_line > line:
+        vertical = f"\033[{to_line - line}B"
+    else:
+        vertical = f"\033[{line - to_line}A"
+    if to_col == col:
+        horizontal = ""
+    elif to_col > col:
+        horizontal = f"\033[{to_col - col}C"
+    else:
+        horizontal = f"\033[{to_col}G"
+    return min(jump, vertical + horizontal, key=len)
+
+
+class TerminalScreen:
+    """
+    What print_maze has drawn on the terminal's alternate screen, so the
+    next draw only sends what changed.
+
+    A new maze, view or palette is drawn in full. Otherwise only the
+    cell bodies whose marker changed (e.g. the path cells when the path
+    is toggled) are rewritten in place, each behind a cursor move.
+    unicode=True draws the half-block layout instead of ASCII.
+    """
+
+    __slots__ = ("out", "unicode", "maze", "version", "view", "glyphs",
+                 "kinds")
+
+    def __init__(self, out: TextIO, unicode: bool = False) -> None:
+        self.out = out
+        self.unicode = unicode
+        self.maze: Maze | None = None
+        self.version = -1
+        self.view = (0, 0, 0, 0)
+        self.glyphs: AsciiGlyphs | UnicodeGlyphs | None = None
+        self.kinds: list[bytearray] = []
+
+    def open(self) -> None:
+        self.out.write(_ALT_SCREEN_ON)
+        self.out.flush()
+
+    def close(self) -> None:
+        self.out.write(_ALT_SCREEN_OFF)
+        self.out.flush()
+
+    def draw(
+        self,
+        maze: Maze,
+        colors: Color,
+        entry: Point | None,
+        exit_: Point | None,
+        path: Sequence[Direction] | None,
+        show_path: bool,
+        view: tuple[int, int, int, int],
+    ) -> None:
+        glyphs: AsciiGlyphs | UnicodeGlyphs = (
+            unicode_glyphs_for(colors) if self.unicode
+            else glyphs_for(colors)
+        )
+        x0, y0, x1, y1 = view
+        width = maze.width
+        marks = _view_marks(
+            maze, view, entry, exit_, path if show_path else None
+        )
+        kinds = [
+            _row_kinds(maze.cells[y * width + x0:y * width + x1],
+                       marks.get(y), x0)
+            for y in range(y0, y1)
+        ]
+        if maze is self.maze and maze.version == self.version \
+                and view == self.view and glyphs is self.glyphs:
+            if isinstance(glyphs, UnicodeGlyphs):
+                self._update_unicode(glyphs, kinds)
+            else:
+                self._update(kinds)
+        else:
+            self.out.write(_CLEAR)
+            write_maze_ascii(
+                self.out, maze, colors, entry, exit_, path, show_path, view,
+                unicode=self.unicode,
+            )
+        self.maze, self.version = maze, maze.version
+        self.view, self.glyphs, self.kinds = view, glyphs, kinds
+
+    def _update(self, kinds: list[bytearray]) -> None:
+        assert isinstance(self.glyphs, AsciiGlyphs) and self.maze
+        styles = self.glyphs.styles
+        cells, width = self.maze.cells, self.maze.width
+        x0, y0 = self.view[0], self.view[1]
+        parts: list[str] = []
+        state = _PLAIN          # what the last escape left in effect
+        line = col = 0          # cursor, 1-based; 0 = unknown
+        for r, (old, new) in enumerate(zip(self.kinds, kinds)):
+            if old == new:
+                continue
+            base = (y0 + r) * width + x0
+            for c, (was, now) in enumerate(zip(old, new)):
+                if was == now:
+                    continue
+                # Body row r is screen line 2r + 2; the body of column c
+                # starts after the wall char at 3c + 1
+                to_line, to_col = 2 * r + 2, 3 * c + 2
+                if to_line == line and to_col == col + 1 and state != _P42 \
+                        and not cells[base + c] & Direction.WEST:
+                    parts.append(" ")       # the open wall in between
+                else:
+                    parts.append(_move(line, col, to_line, to_col))
+                if now != state and (now != _PLAIN or state == _P42):
+                    parts.append((RESET if state == _P42 else "")
+                                 + styles[now])
+                    state = now
+                parts.append(_MARKS[now])
+                line, col = to_line, to_col + 2
+        if state != _PLAIN:
+            parts.append(RESET)
+        self.out.write("".join(parts))
+
+    def _update_unicode(
+        self,
+        glyphs: UnicodeGlyphs,
+        kinds: list[bytearray],
+    ) -> None:
+        assert self.maze is not None
+        cells, width = self.maze.cells, self.maze.width
+        x0, y0 = self.view[0], self.view[1]
+        parts: list[str] = []
+        state = (_NONE, _NONE)
+        line = col = 0
+        for r, (old, new) in enumerate(zip(self.kinds, kinds)):
+            if old == new:
+                continue
+            base = (y0 + r) * width + x0
+            for c, (was, now) in enumerate(zip(old, new)):
+                if was == now:
+                    continue
+                # A cell is the lower half of character 2c + 2 of line
+                # r + 1, under its north wall
+                to_line, to_col = r + 1, 2 * c + 2
+                parts.append(_move(line, col, to_line, to_col))
+                north = _NORTH_BIT[cells[base + c]]
+                char, fg, bg = glyphs.chars[
+                    north * _SLOTS + _KIND_SLOT[now]
+                ]
+                escape, state = glyphs.restyle(state, fg, bg)
+                parts.append(escape + char)
+                line, col = to_line, to_col + 1
+        if state != (_NONE, _NONE):
+            parts.append(RESET)
+        self.out.write("".join(parts))
+
+    def below(self) -> None:
+        """Move to the line under the maze and clear the rest"""
+        rows = self.view[3] - self.view[1]
+        lines = (rows + 2) if self.unicode else (2 * rows + 2)
+        self.out.write(f"\033[{lines};1H\033[J")
+        self.out.flush()
+
+
+def _view_size(
+    maze: Maze,
+    menu_lines: int,
+    unicode: bool = False,
+) -> tuple[int, int]:
+    """Cells that fit the terminal, leaving room for the menu"""
+    if not sys.stdout.isatty():
+        return maze.width, maze.height
+    cols, lines = shutil.get_terminal_size()
+    # chars per cell across, and lines per cell down
+    across, down = (2, 1) if unicode else (3, 2)
+    return (
+        max(1, min(maze.width, (cols - 1) // across)),
+        max(1, min(maze.height, (lines - menu_lines - 1) // down)),
+    )
+
+
+def _scroll(
+    origin: Point,
+    size: tuple[int, int],
+    maze: Maze,
+) -> Point:
+    """Move the view origin by half a screen per w/a/s/d letter read"""
+    moves = input("Scroll with w/a/s/d (repeat to go further): ")
+    x, y = origin
+    w, h = size
+    for key in moves.lower():
+        dx, dy = _SCROLL_KEYS.get(key, (0, 0))
+        x += dx * max(1, w // 2)
+        y += dy * max(1, h // 2)
+    return (
+        max(0, min(x, maze.width - w)),
+        max(0, min(y, maze.height - h)),
+    )
+
+
+def _get_next_action(choices: int = 4) -> int:
+    inp: str = input(f"Choice? (1-{choices}) ")
     try:
         next_action = int(inp)
-    except:
+    except ValueError:
         next_action = 0
     return next_action
 
@@ -144,35 +660,76 @@ def print_maze(
     colors: Color,
     logger: logging.Logger
 ) -> None:
-        show_path = cfg.show_path
-        next_action: int = 0
-        maze, path = make_maze(cfg, logger)
+    show_path = cfg.show_path
+    next_action: int = 0
+    maze, path = make_maze(cfg, logger)
+    origin: Point = (0, 0)
+    # On a terminal the maze and menu live on the alternate screen and
+    # redraws only send what changed; anything else gets plain text
+    unicode = cfg.display == "unicode"
+    screen = (
+        TerminalScreen(sys.stdout, unicode) if sys.stdout.isatty()
+        else None
+    )
+    if screen:
+        screen.open()
+    try:
         while next_action != 4:
-            rendered = render_maze_ascii(
-                maze,
-                colors=colors,
-                entry=cfg.entry,
-                exit_=cfg.exit,
-                path=path,
-                show_path=show_path,
+            # Only the part of the maze that fits the terminal is
+            # drawn; option 5 scrolls when the maze is larger
+            view_w, view_h = _view_size(maze, _MENU_LINES, unicode)
+            scrolls = (view_w, view_h) != (maze.width, maze.height)
+            origin = (
+                min(origin[0], maze.width - view_w),
+                min(origin[1], maze.height - view_h),
             )
-            print(rendered)
+            view = (*origin, origin[0] + view_w, origin[1] + view_h)
+            if screen:
+                screen.draw(maze, colors, cfg.entry, cfg.exit, path,
+                            show_path, view)
+                screen.below()
+            else:
+                write_maze_ascii(
+                    sys.stdout,
+                    maze,
+                    colors=colors,
+                    entry=cfg.entry,
+                    exit_=cfg.exit,
+                    path=path,
+                    show_path=show_path,
+                    view=view,
+                    unicode=unicode,
+                )
+            if scrolls:
+                print(
+                    f"Cells {view[0]}-{view[2] - 1} x "
+                    f"{view[1]}-{view[3] - 1} "
+                    f"of {maze.width}x{maze.height}"
+                )
             print("=== A-maze-ing ===")
             print("1. Re-generate a new maze")
             print("2. Show/Hide path from entry to exit")
             print("3. Change maze colors")
             print("4. Quit")
-            next_action = _get_next_action()
+            if scrolls:
+                print("5. Scroll the view")
+            next_action = _get_next_action(5 if scrolls else 4)
             if next_action == 1:
                 if cfg.seed is None:
                     cfg.seed = 42
                 else:
                     cfg.seed = int(cfg.seed) + 1
                 maze, path = make_maze(cfg, logger)
+                origin = (0, 0)
             elif next_action == 2:
                 show_path = not show_path
             elif next_action == 3:
                 colors.random()
+            elif next_action == 5 and scrolls:
+                origin = _scroll(origin, (view_w, view_h), maze)
             elif next_action != 4:
                 while 1 <= next_action <= 4:
                     next_action = _get_next_action()
+    finally:
+        if screen:
+            screen.close()
@@ -1,7 +1,7 @@
 from __future__ import annotations
 import logging
 
-from typing import Sequence
+from typing import Iterable, Sequence
 from mlx import Mlx
 from maze import make_maze
 from utils import Maze, Button, Color, Config, Direction, Drawer, MlxContext, Point
@@ -49,46 +49,68 @@ def path_cells_from_path(
     return cells
 
 
-def redraw(ctx: MlxContext, cfg: Config) -> None:
-    drawer: Drawer = ctx.drawer
-
-    h = len(ctx.maze)
-    w = len(ctx.maze[0])
-
-    """Clear full background"""
-    drawer.fill_rect(0, 0, ctx.win_w, ctx.win_h, fill_color=ctx.colors.bg)
-
-    """Draw buttons """
-    for b in (ctx.btn_new, ctx.btn_path, ctx.btn_wall):
-        b.draw(drawer, ctx.colors)
+def draw_maze(
+    drawer: Drawer,
+    maze: Maze,
+    colors: Color,
+    entry: Point,
+    exit_: Point,
+    path_cells: Iterable[Point],
+    show_path: bool,
+        ) -> None:
+    """Rasterize walls, path and entry/exit markers into the image buffer"""
+    h = maze.height
+    w = maze.width
+    cells = maze.cells
 
     """Draw maze walls"""
     for y in range(h):
         for x in range(w):
-            cell = int(ctx.maze[y][x])
+            cell = cells[y * w + x]
             px = x * CELL
             py = y * CELL + UI_H
 
             if cell & N:
-                drawer.hline(px, px + CELL, py, ctx.colors.wall)
+                drawer.hline(px, px + CELL, py, colors.wall)
             if cell & W:
-                drawer.vline(px, py, py + CELL, ctx.colors.wall)
+                drawer.vline(px, py, py + CELL, colors.wall)
 
             if y == h - 1 and (cell & S):
-                drawer.hline(px, px + CELL, py + CELL, ctx.colors.wall)
+                drawer.hline(px, px + CELL, py + CELL, colors.wall)
             if x == w - 1 and (cell & E):
-                drawer.vline(px + CELL, py, py + CELL, ctx.colors.wall)
+                drawer.vline(px + CELL, py, py + CELL, colors.wall)
 
     """Path overlay"""
-    if ctx.show_path:
-        for (px, py) in ctx.path_cells:
-            draw_dot(drawer, px, py, ctx.colors.path)
+    if show_path:
+        for (px, py) in path_cells:
+            draw_dot(drawer, px, py, colors.path)
 
     """Entry / Exit"""
-    (en_x, en_y) = cfg.entry
-    (ex_x, ex_y) = cfg.exit
-    draw_dot(drawer, en_x, en_y, ctx.colors.entry)
-    draw_dot(drawer, ex_x, ex_y, ctx.colors.exit)
+    (en_x, en_y) = entry
+    (ex_x, ex_y) = exit_
+    draw_dot(drawer, en_x, en_y, colors.entry)
+    draw_dot(drawer, ex_x, ex_y, colors.exit)
+
+
+def redraw(ctx: MlxContext, cfg: Config) -> None:
+    drawer: Drawer = ctx.drawer
+
+    """Clear full background"""
+    drawer.fill_rect(0, 0, ctx.win_w, ctx.win_h, fill_color=ctx.colors.bg)
+
+    """Draw buttons """
+    for b in (ctx.btn_new, ctx.btn_path, ctx.btn_wall):
+        b.draw(drawer, ctx.colors)
+
+    draw_maze(
+        drawer,
+        ctx.maze,
+        ctx.colors,
+        cfg.entry,
+        cfg.exit,
+        ctx.path_cells,
+        ctx.show_path,
+    )
 
     """Blit image to window"""
     ctx.m.mlx_put_image_to_window(ctx.mlx_ptr, ctx.win_ptr, ctx.img, 0, 0)
@@ -1,7 +1,18 @@
 from .decorators import safe
 from .drawer import Drawer
 from .buttons import Button
-from .io_utils import load_maze, dump_maze
+from .io_utils import (
+    load_maze,
+    dump_maze,
+    write_maze,
+    write_trailer,
+    write_hex_rows,
+    hex_cell_reader,
+    open_maze_file,
+    is_compressed,
+    MazeFileReader,
+)
+from .packed_io import PackedMaze, dump_packed, load_packed
 from .color import Color
 from .config import Config
 from .mlx_context import MlxContext
@@ -11,6 +22,7 @@ from .maze_types import (
     Direction,
     CLOSED_CELL,
     EMPTY_CELL,
+    ROOT,
 )
 
 __all__ = [
@@ -20,11 +32,22 @@ __all__ = [
     "Button",
     "load_maze",
     "dump_maze",
+    "write_maze",
+    "write_trailer",
+    "write_hex_rows",
+    "hex_cell_reader",
+    "open_maze_file",
+    "is_compressed",
+    "MazeFileReader",
+    "PackedMaze",
+    "dump_packed",
+    "load_packed",
     "Maze",
     "Point",
     "Direction",
     "MlxContext",
     "CLOSED_CELL",
     "EMPTY_CELL",
+    "ROOT",
     "safe"
 ]
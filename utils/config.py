@@ -12,6 +12,10 @@ class Config:
     show_path: bool
     output_file: str = "maze.txt"
     seed: int | None = None
+    algorithm: str = "backtracking"
+    algorithm_version: int = 1
+    engine: str = "python"
+    solver: str = "bfs"
     # colour settings (0xRRGGBB)
     color_wall: int = 0xFFFFFF
     color_path: int = 0x00FF00
@@ -20,7 +24,7 @@ class Config:
     color_pattern42: int = 0xFFAA00
     color_background: int = 0x000000
     # display mode
-    display: str = "ascii"   # "ascii", "mlx", or "both"
+    display: str = "ascii"   # "ascii", "unicode", "mlx", or "both"
 
     @classmethod
     def load(cls, filename: str = "utils/default.cfg") -> Config:
@@ -77,6 +81,11 @@ class Config:
             output_file=d.get("OUTPUT_FILE", "maze.txt").strip(),
             perfect=perfect,
             seed=d.getint("SEED", fallback=None),
+            algorithm=d.get("ALGORITHM", "backtracking").strip().lower()
+            .replace("-", "_"),
+            algorithm_version=d.getint("ALGORITHM_VERSION", fallback=1),
+            engine=d.get("ENGINE", "python").strip().lower(),
+            solver=d.get("SOLVER", "bfs").strip().lower(),
             show_path=d.getboolean("SHOW_PATH", fallback=True),
             color_wall=cls._parse_color(d.get("COLOR_WALL", "0xFFFFFF")),
             color_path=cls._parse_color(d.get("COLOR_PATH", "0x00FF00")),
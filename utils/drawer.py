@@ -1,7 +1,26 @@
 from __future__ import annotations
 
+from functools import lru_cache
+
 from  .color import Color
+
+
+@lru_cache(maxsize=64)
+def _pixel(color: int) -> bytes:
+    """The 4 bytes of one pixel of color, as put_pixel lays them out"""
+    return bytes((*Color.hex_to_rgb(color), 255))
+
+
 class Drawer:
+    """
+    Draws into an image buffer of 4-byte pixels, line_length bytes a row.
+
+    span, column and fill are the bulk primitives: a colour is packed
+    into its 4 bytes once, a row is filled with one slice assignment, a
+    column with one strided assignment per byte, and a rectangle copies
+    its first row down. hline, vline and fill_rect draw through them.
+    """
+
     def __init__(self, buf: memoryview, line_length: int) -> None:
         self.buf = buf
         self.line_length = line_length
@@ -13,10 +32,31 @@ class Drawer:
         color: tuple[int, int, int]
             ) -> None:
         off = y * self.line_length + x * 4
-        self.buf[off + 0] = color[0]
-        self.buf[off + 1] = color[1]
-        self.buf[off + 2] = color[2]
-        self.buf[off + 3] = 255
+        self.buf[off:off + 4] = bytes((*color, 255))
+
+    def span(self, x: int, y: int, n: int, color: int) -> None:
+        """Fill n pixels of row y from x"""
+        off = y * self.line_length + x * 4
+        self.buf[off:off + 4 * n] = _pixel(color) * n
+
+    def column(self, x: int, y: int, n: int, color: int) -> None:
+        """Fill n pixels of column x from y"""
+        step = self.line_length
+        off = y * step + x * 4
+        end = off + (n - 1) * step + 1
+        for k, byte in enumerate(_pixel(color)):
+            self.buf[off + k:end + k:step] = bytes((byte,)) * n
+
+    def fill(self, x: int, y: int, w: int, h: int, color: int) -> None:
+        """Fill a w x h rectangle"""
+        if w <= 0 or h <= 0:
+            return
+        self.span(x, y, w, color)
+        buf, step = self.buf, self.line_length
+        first = y * step + x * 4
+        row = buf[first:first + 4 * w]
+        for off in range(first + step, first + h * step, step):
+            buf[off:off + 4 * w] = row
 
     def hline(
         self,
@@ -27,8 +67,7 @@ class Drawer:
             ) -> None:
         if x0 > x1:
             x0, x1 = x1, x0
-        for x in range(x0, x1 + 1):
-            self.put_pixel(x, y, Color.hex_to_rgb(color))
+        self.span(x0, y, x1 - x0 + 1, color)
 
     def vline(
         self,
@@ -39,8 +78,7 @@ class Drawer:
             ) -> None:
         if y0 > y1:
             y0, y1 = y1, y0
-        for yy in range(y0, y1 + 1):
-            self.put_pixel(x, yy, Color.hex_to_rgb(color))
+        self.column(x, y0, y1 - y0 + 1, color)
 
     def fill_rect(
         self,
@@ -52,9 +90,8 @@ class Drawer:
         border_color: int | None = None,
             ) -> None:
         if fill_color is not None:
-            for yy in range(y, y + h):
-                self.hline(x, x + w - 1, yy, fill_color)
-        
+            self.fill(x, y, w, h, fill_color)
+
         if border_color is not None:
             self.hline(x, x + w - 1, y, border_color)
             self.hline(x, x + w - 1, y + h - 1, border_color)
@@ -1,8 +1,64 @@
 from __future__ import annotations
 
-from typing import Iterable
+import gzip
+import lzma
+import mmap
+import os
+from itertools import islice
+from typing import (
+    IO, Any, BinaryIO, Callable, Iterable, Literal, TextIO, cast, overload,
+)
 from .maze_types import Maze, Point, Direction
 
+_HEX_DIGITS = "0123456789ABCDEF"
+_HEX_CHARS = b"0123456789ABCDEFabcdef"
+_NIBBLES = bytes(range(16))
+# cell value -> hex digit byte, and hex digit byte -> cell value
+_HEX_BYTES = bytes(
+    ord(_HEX_DIGITS[c]) if c < 16 else 0 for c in range(256)
+)
+_HEX_VALUES = bytes(
+    int(chr(c), 16) if c in _HEX_CHARS else 0 for c in range(256)
+)
+# Rows are encoded and written in blocks of about this many bytes
+_WRITE_BLOCK = 1 << 20
+_BY_LETTER = {str(d): d for d in Direction}
+
+# File extensions that are compressed transparently
+_OPENERS: dict[str, Callable[..., IO[Any]]] = {
+    ".gz": gzip.open,
+    ".xz": lzma.open,
+    ".lzma": lzma.open,
+}
+
+
+@overload
+def open_maze_file(
+    filename: str,
+    mode: Literal["rb", "wb", "ab"],
+) -> BinaryIO: ...
+
+
+@overload
+def open_maze_file(
+    filename: str,
+    mode: Literal["rt", "wt", "at"],
+    *,
+    encoding: str | None = None,
+    newline: str | None = None,
+) -> TextIO: ...
+
+
+def open_maze_file(filename: str, mode: str, **kwargs: Any) -> IO[Any]:
+    """open(), or gzip/lzma open() when the extension asks for it"""
+    ext = os.path.splitext(filename)[1].lower()
+    return cast(IO[Any], _OPENERS.get(ext, open)(filename, mode, **kwargs))
+
+
+def is_compressed(filename: str) -> bool:
+    """True when open_maze_file would compress or decompress filename"""
+    return os.path.splitext(filename)[1].lower() in _OPENERS
+
 
 def dump_maze(
     maze: Maze,
@@ -24,86 +80,258 @@ def dump_maze(
     if not maze:
         raise ValueError("Maze is empty")
 
-    width = len(maze[0])
+    with open_maze_file(
+        filename, "wt", encoding="utf-8", newline="\n"
+    ) as f:
+        write_maze(f, maze, start, finish, path)
 
-    with open(filename, "w", encoding="utf-8", newline="\n") as f:
 
-        # Write maze grid
-        for row_index, row in enumerate(maze):
-
-            if len(row) != width:
-                raise ValueError(
-                    f"Inconsistent row width at row {row_index}"
-                )
+def write_maze(
+    f: TextIO,
+    maze: Maze,
+    start: Point | None,
+    finish: Point | None,
+    path: Iterable[Direction],
+) -> None:
+    """Write maze in the dump_maze format to an open text stream."""
 
-            hex_row = []
+    if not maze:
+        raise ValueError("Maze is empty")
 
+    cells = maze.cells
+    if cells.translate(None, _NIBBLES):     # anything left is above 0xF
+        for row_index, row in enumerate(maze):
             for col_index, cell in enumerate(row):
-
-                if not isinstance(cell, int):
-                    raise ValueError(
-                        f"Invalid cell type at ({col_index},{row_index})"
-                    )
-
-                # Ensure single hex digit
-                if not (0 <= cell <= 0xF):
+                if cell > 0xF:
                     raise ValueError(
                         f"Cell value out of range at "
                         f"({col_index},{row_index}): {cell}"
                     )
 
-                hex_row.append(f"{int(cell):X}")
+    # Encode the grid in blocks of rows, one translate and write per block
+    width = maze.width
+    rows_per_block = max(1, _WRITE_BLOCK // (width + 1))
+    for top in range(0, maze.height, rows_per_block):
+        bottom = min(top + rows_per_block, maze.height)
+        block = cells[top * width:bottom * width].translate(_HEX_BYTES)
+        lines: list[bytes | bytearray] = [
+            block[i:i + width] for i in range(0, len(block), width)
+        ]
+        lines.append(b"")
+        f.write(b"\n".join(lines).decode("ascii"))
+    write_trailer(f, start, finish, path)
+
 
-            f.write("".join(hex_row) + "\n")
-        # Empty line
+def write_trailer(
+    f: TextIO,
+    start: Point | None,
+    finish: Point | None,
+    path: Iterable[Direction],
+) -> None:
+    """Write the part of the format that follows the grid."""
+    # Empty line
+    f.write("\n")
+    # Entry / Exit
+    if start:
+        f.write(f"{start[0]},{start[1]}\n")
+    else:
         f.write("\n")
-        # Entry / Exit
-        if start:
-            f.write(f"{start[0]},{start[1]}\n")
-        else:
-            f.write("\n")
 
-        if finish:
-            f.write(f"{finish[0]},{finish[1]}\n")
-        else:
-            f.write("\n")
+    if finish:
+        f.write(f"{finish[0]},{finish[1]}\n")
+    else:
+        f.write("\n")
 
-        # 1Path
-        f.write("".join(str(d) for d in path) + "\n")
+    # 1Path, in blocks so a long one is never held as one string
+    steps = iter(path)
+    while block := "".join(str(d) for d in islice(steps, _WRITE_BLOCK)):
+        f.write(block)
+    f.write("\n")
+
+
+def write_hex_rows(
+    f: BinaryIO,
+    rows: Iterable[bytes | bytearray],
+) -> tuple[int, int]:
+    """
+    Write grid rows of cell values (one byte per cell) as hex lines,
+    one row at a time. Returns the (width, height) written.
+    """
+    width = -1
+    height = 0
+    for row in rows:
+        if width < 0:
+            width = len(row)
+        elif len(row) != width:
+            raise ValueError(f"Inconsistent row width at row {height}")
+        if max(row, default=0) > 0xF:
+            raise ValueError(f"Cell value out of range in row {height}")
+        f.write(row.translate(_HEX_BYTES) + b"\n")
+        height += 1
+    if not height:
+        raise ValueError("Maze is empty")
+    return width, height
+
+
+def hex_cell_reader(
+    data: bytes | mmap.mmap,
+    width: int,
+) -> Callable[[int, int], int]:
+    """
+    Cell accessor over the grid part of a maze file held in a buffer
+    (typically an mmap), without parsing the rest of the file.
+    """
+    stride = width + 1
+
+    def cell_at(x: int, y: int) -> int:
+        return _HEX_VALUES[data[y * stride + x]]
+    return cell_at
+
+
+class MazeFileReader:
+    """
+    Random access to a maze file in the dump_maze format without parsing it.
+
+    The file is memory-mapped. Every grid row has the width of the first
+    line, so cell (x, y) is at a fixed offset; the entry/exit/path trailer
+    is found by searching back from the end of the file. Nothing else is
+    read until asked for. Compressed files cannot be mapped; use
+    load_maze for those. Use as a context manager, or call close().
+    """
+
+    def __init__(self, filename: str) -> None:
+        if is_compressed(filename):
+            raise ValueError(f"{filename} is compressed, use load_maze")
+        with open(filename, "rb") as f:
+            if not os.fstat(f.fileno()).st_size:
+                raise ValueError("Maze file is empty")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._index(filename)
+        except Exception:
+            self._mm.close()
+            raise
+
+    def _index(self, filename: str) -> None:
+        mm = self._mm
+        newline = mm.find(b"\n")
+        if newline <= 0:
+            raise ValueError(f"{filename} has no maze grid")
+        crlf = mm[newline - 1] == ord("\r")
+        self.width = newline - crlf
+        self._stride = newline + 1
+
+        # Trailer, last line first: path, exit, entry, then the blank
+        # line that ends the grid
+        end = len(mm)
+        lines: list[bytes] = []
+        for _ in range(3):
+            if end and mm[end - 1] == ord("\n"):
+                end -= 1
+            start = mm.rfind(b"\n", 0, end) + 1
+            lines.append(mm[start:end].rstrip(b"\r"))
+            end = start
+        self._path_text, exit_line, entry_line = (
+            line.decode("ascii") for line in lines
+        )
+        grid_end = end - 1 - crlf
+        if grid_end <= 0 or grid_end % self._stride:
+            raise ValueError(f"{filename} has a malformed grid or trailer")
+        self.height = grid_end // self._stride
+        self.entry = _parse_point(entry_line)
+        self.exit = _parse_point(exit_line)
+
+    def row(self, y: int) -> bytes:
+        """Cell values of row y, one byte per cell"""
+        if not 0 <= y < self.height:
+            raise IndexError(f"Row {y} is outside the maze")
+        start = y * self._stride
+        line = self._mm[start:start + self.width]
+        if line.translate(None, _HEX_CHARS):
+            raise ValueError(f"Invalid hex char in row {y}")
+        return line.translate(_HEX_VALUES)
+
+    def cell(self, x: int, y: int) -> int:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"Cell ({x},{y}) is outside the maze")
+        char = self._mm[y * self._stride + x]
+        if char not in _HEX_CHARS:
+            raise ValueError(f"Invalid hex char at ({x},{y})")
+        return _HEX_VALUES[char]
+
+    def region(self, x0: int, y0: int, x1: int, y1: int) -> Maze:
+        """Cells x0 <= x < x1, y0 <= y < y1 as a standalone Maze"""
+        if not (0 <= x0 < x1 <= self.width and 0 <= y0 < y1 <= self.height):
+            raise IndexError(
+                f"Region ({x0},{y0})-({x1},{y1}) is outside the maze"
+            )
+        cells = bytearray()
+        for y in range(y0, y1):
+            cells += self.row(y)[x0:x1]
+        return Maze(x1 - x0, y1 - y0, cells=cells)
+
+    def path_str(self) -> str:
+        return self._path_text
+
+    def path(self) -> list[Direction]:
+        try:
+            return [_BY_LETTER[c] for c in self._path_text]
+        except KeyError as e:
+            raise ValueError(f"Invalid path step {e.args[0]!r}")
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> MazeFileReader:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _parse_point(line: str) -> Point | None:
+    if not line:
+        return None
+    try:
+        x, y = line.split(",")
+        return int(x), int(y)
+    except ValueError:
+        raise ValueError(f"Invalid coordinates {line!r}")
 
 
 def load_maze(filename: str) -> Maze:
-    maze: Maze = []
+    cells = bytearray()
+    width = 0
+    height = 0
 
-    with open(filename, "r", encoding="utf-8") as f:
+    with open_maze_file(filename, "rb") as f:
         for line_number, line in enumerate(f, start=1):
-            line = line.rstrip("\n")
+            line = line.rstrip(b"\r\n")
 
             if not line:
                 break
 
-            row = []
-
-            for col_index, char in enumerate(line):
-
-                if char not in "0123456789ABCDEFabcdef":
-                    raise ValueError(
-                        f"Invalid hex char at line {line_number}, "
-                        f"column {col_index}"
-                    )
+            if height == 0:
+                width = len(line)
+            elif len(line) != width:
+                raise ValueError(
+                    f"Inconsistent row width at row {height}"
+                )
 
-                row.append(int(char, 16))
+            # One check per row; only a bad row is scanned for the culprit
+            if line.translate(None, _HEX_CHARS):
+                col_index = next(
+                    i for i, c in enumerate(line) if c not in _HEX_CHARS
+                )
+                raise ValueError(
+                    f"Invalid hex char at line {line_number}, "
+                    f"column {col_index}"
+                )
 
-            maze.append(row)
+            cells += line.translate(_HEX_VALUES)
+            height += 1
 
-    if not maze:
+    if not height:
         raise ValueError("Maze file is empty")
 
-    width = len(maze[0])
-    for row_index, row in enumerate(maze):
-        if len(row) != width:
-            raise ValueError(
-                f"Inconsistent row width at row {row_index}"
-            )
-
-    return maze
+    return Maze(width, height, cells=cells)
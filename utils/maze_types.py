@@ -1,13 +1,97 @@
 from __future__ import annotations
 
 from enum import IntFlag, auto
-from typing import TypeAlias
+from typing import Iterator, Sequence, TypeAlias
 
 
-Maze: TypeAlias = list[list[int]]
 Point: TypeAlias = tuple[int, int]
 
 
+class Maze:
+    """
+    Maze grid stored row-major in a single bytearray, one byte per cell.
+
+    Cell (x, y) lives at cells[y * width + x] and holds its closed wall
+    bits (see Direction). maze[y] returns a writable memoryview of row y,
+    so maze[y][x] still works; hot loops should index cells directly.
+
+    version is bumped by touch(); code that edits a maze after it was
+    generated must call it so cached search results are dropped.
+    """
+
+    __slots__ = ("width", "height", "cells", "version", "__weakref__")
+
+    def __init__(
+        self,
+        width: int = 0,
+        height: int = 0,
+        fill: int = 0,
+        cells: bytearray | None = None,
+    ) -> None:
+        if cells is None:
+            cells = bytearray([fill]) * (width * height)
+        elif len(cells) != width * height:
+            raise ValueError(
+                f"Grid buffer has {len(cells)} cells, "
+                f"expected {width}x{height}"
+            )
+        self.width = width
+        self.height = height
+        self.cells = cells
+        self.version = 0
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[int]]) -> Maze:
+        height = len(rows)
+        width = len(rows[0]) if height else 0
+        cells = bytearray()
+        for row_index, row in enumerate(rows):
+            if len(row) != width:
+                raise ValueError(
+                    f"Inconsistent row width at row {row_index}"
+                )
+            cells.extend(row)
+        return cls(width, height, cells=cells)
+
+    def to_rows(self) -> list[list[int]]:
+        return [list(row) for row in self]
+
+    def touch(self) -> None:
+        self.version += 1
+
+    def index(self, x: int, y: int) -> int:
+        return y * self.width + x
+
+    def copy(self) -> Maze:
+        return Maze(self.width, self.height, cells=bytearray(self.cells))
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y: int) -> memoryview:
+        if y < 0:
+            y += self.height
+        if not 0 <= y < self.height:
+            raise IndexError("maze row out of range")
+        start = y * self.width
+        return memoryview(self.cells)[start:start + self.width]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        view = memoryview(self.cells)
+        w = self.width
+        for start in range(0, w * self.height, w):
+            yield view[start:start + w]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Maze):
+            return NotImplemented
+        return (self.width, self.height, self.cells) == \
+            (other.width, other.height, other.cells)
+
+    def __repr__(self) -> str:
+        return f"Maze({self.width}x{self.height})"
+
+
 class Direction(IntFlag):
     """Cardinal directions with bit flags for wall encoding."""
     NORTH = auto()
@@ -22,21 +106,11 @@ class Direction(IntFlag):
 
     @property
     def opposite(self) -> Direction:
-        return {
-            Direction.NORTH: Direction.SOUTH,
-            Direction.SOUTH: Direction.NORTH,
-            Direction.EAST: Direction.WEST,
-            Direction.WEST: Direction.EAST,
-        }[self]
+        return _OPPOSITES[self]
 
     @property
     def delta(self) -> tuple[int, int]:
-        return {
-            Direction.NORTH: (0, -1),
-            Direction.EAST: (1, 0),
-            Direction.SOUTH: (0, 1),
-            Direction.WEST: (-1, 0),
-        }[self]
+        return _DELTAS[self]
 
     @classmethod
     def from_str(cls, value: str) -> Direction:
@@ -49,6 +123,21 @@ class Direction(IntFlag):
         raise ValueError(f"Invalid direction: {value}")
 
 
+_OPPOSITES: dict[Direction, Direction] = {
+    Direction.NORTH: Direction.SOUTH,
+    Direction.SOUTH: Direction.NORTH,
+    Direction.EAST: Direction.WEST,
+    Direction.WEST: Direction.EAST,
+}
+
+_DELTAS: dict[Direction, tuple[int, int]] = {
+    Direction.NORTH: (0, -1),
+    Direction.EAST: (1, 0),
+    Direction.SOUTH: (0, 1),
+    Direction.WEST: (-1, 0),
+}
+
+
 CLOSED_CELL = (
     Direction.NORTH
     | Direction.EAST
@@ -57,3 +146,7 @@ CLOSED_CELL = (
 )
 
 EMPTY_CELL = Direction(0)
+
+# Link stored for a root cell in the per-cell parent / came_from arrays of
+# the generators and solvers; the Direction bits are 1..8, so never 16
+ROOT = 16
@@ -4,8 +4,8 @@ from dataclasses import dataclass
 from .config import Config
 from mlx import Mlx
 from .drawer import Drawer
-from typing import Any, Sequence
-from .maze_types import Maze, Point, Direction
+from typing import Any, Iterable
+from .maze_types import Maze, Point
 from .buttons import Button
 from .color import Color
 @dataclass
@@ -24,7 +24,7 @@ class MlxContext:
     maze: Maze
     entry: Point
     exit: Point
-    path_cells: Sequence[Direction]
+    path_cells: Iterable[Point]
     btn_new: Button
     btn_path: Button
     btn_wall: Button
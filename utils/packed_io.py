@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import mmap
+import struct
+from typing import Iterable
+
+from .maze_types import Maze, Point, Direction
+
+# Layout (all little-endian):
+#   header  magic, version, width, height, entry x/y, exit x/y, path steps
+#   grid    width * height cells, two per byte, first cell in the high
+#           nibble, padded with 0 to a whole byte
+#   path    steps as 2-bit codes (N, E, S, W = 0..3), four per byte,
+#           first step in the top bits, padded with 0
+# Entry and exit coordinates are _NO_POINT when the maze has none.
+_MAGIC = b"AMZP"
+VERSION = 1
+_HEADER = struct.Struct("<4sH6IQ")
+_NO_POINT = 0xFFFFFFFF
+
+_NIBBLES = bytes(range(16))
+_HIGH = bytes((c << 4) & 0xF0 for c in range(256))
+_TOP_NIBBLE = bytes(c >> 4 for c in range(256))
+_LOW_NIBBLE = bytes(c & 0xF for c in range(256))
+
+_LETTER_CODES = bytes.maketrans(b"NESW", b"\x00\x01\x02\x03")
+_CODE_LETTERS = bytes.maketrans(b"\x00\x01\x02\x03", b"NESW")
+_BY_LETTER = {str(d): d for d in Direction}
+# byte of four codes -> code at position k (k = 0 is the top two bits)
+_CODE_AT = [
+    bytes((c >> (6 - 2 * k)) & 3 for c in range(256)) for k in range(4)
+]
+
+
+def _join(
+    parts: list[bytes | bytearray],
+    shifts: list[int],
+    size: int,
+) -> bytes:
+    """OR same-length byte strings, each shifted left by its bit count"""
+    value = 0
+    for part, shift in zip(parts, shifts):
+        value |= int.from_bytes(part, "big") << shift
+    return value.to_bytes(size, "big")
+
+
+def pack_cells(cells: bytes | bytearray) -> bytes:
+    if cells.translate(None, _NIBBLES):     # anything left is above 0xF
+        raise ValueError("Cell value out of range (above 0xF)")
+    if len(cells) % 2:
+        cells = bytes(cells) + b"\0"
+    size = len(cells) // 2
+    # Nibbles never overlap, so shifting the high ones into place and
+    # OR-ing the two halves as big integers packs the grid in bulk
+    return _join(
+        [cells[0::2].translate(_HIGH), cells[1::2]], [0, 0], size
+    )
+
+
+def unpack_cells(packed: bytes | memoryview, count: int) -> bytearray:
+    data = bytes(packed)
+    cells = bytearray(2 * len(data))
+    cells[0::2] = data.translate(_TOP_NIBBLE)
+    cells[1::2] = data.translate(_LOW_NIBBLE)
+    del cells[count:]
+    return cells
+
+
+def pack_path(path: Iterable[Direction]) -> tuple[bytes, int]:
+    """(packed bytes, step count) of a path"""
+    codes = "".join(str(d) for d in path).encode().translate(_LETTER_CODES)
+    steps = len(codes)
+    codes += b"\0" * (-steps % 4)
+    packed = _join([codes[k::4] for k in range(4)], [6, 4, 2, 0],
+                   len(codes) // 4)
+    return packed, steps
+
+
+def unpack_path(packed: bytes | memoryview, steps: int) -> list[Direction]:
+    data = bytes(packed)
+    codes = bytearray(4 * len(data))
+    for k in range(4):
+        codes[k::4] = data.translate(_CODE_AT[k])
+    del codes[steps:]
+    return [_BY_LETTER[c] for c in codes.translate(_CODE_LETTERS).decode()]
+
+
+def dump_packed(
+    maze: Maze,
+    start: Point | None,
+    finish: Point | None,
+    path: Iterable[Direction],
+    filename: str,
+) -> None:
+    """Write maze, entry, exit and path in the packed binary format."""
+    if not maze:
+        raise ValueError("Maze is empty")
+    grid = pack_cells(maze.cells)
+    packed_path, steps = pack_path(path)
+    sx, sy = start if start else (_NO_POINT, _NO_POINT)
+    fx, fy = finish if finish else (_NO_POINT, _NO_POINT)
+    with open(filename, "wb") as f:
+        f.write(_HEADER.pack(
+            _MAGIC, VERSION, maze.width, maze.height, sx, sy, fx, fy, steps
+        ))
+        f.write(grid)
+        f.write(packed_path)
+
+
+class PackedMaze:
+    """
+    A packed maze file mapped into memory; nothing is decoded up front.
+
+    cell(x, y) reads straight from the mapping and grid is a view of the
+    packed cells. Solvers and renderers want one byte per cell, so they
+    need to_maze(), which unpacks the whole grid into a new Maze. Use as
+    a context manager, or call close().
+    """
+
+    def __init__(self, filename: str) -> None:
+        with open(filename, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse(filename)
+        except Exception:
+            self._mm.close()
+            raise
+
+    def _parse(self, filename: str) -> None:
+        mm = self._mm
+        if len(mm) < _HEADER.size or mm[:4] != _MAGIC:
+            raise ValueError(f"{filename} is not a packed maze file")
+        (_, version, width, height, sx, sy, fx, fy,
+         steps) = _HEADER.unpack_from(mm)
+        if version != VERSION:
+            raise ValueError(
+                f"Unsupported packed maze version {version} in {filename}"
+            )
+        grid_size = (width * height + 1) // 2
+        path_size = (steps + 3) // 4
+        if len(mm) != _HEADER.size + grid_size + path_size:
+            raise ValueError(f"Packed maze file {filename} is truncated")
+        self.width = width
+        self.height = height
+        self.entry: Point | None = (sx, sy) if sx != _NO_POINT else None
+        self.exit: Point | None = (fx, fy) if fx != _NO_POINT else None
+        self.steps = steps
+        view = memoryview(mm)
+        self.grid = view[_HEADER.size:_HEADER.size + grid_size]
+        self._path = view[_HEADER.size + grid_size:]
+
+    def cell(self, x: int, y: int) -> int:
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"Cell ({x},{y}) is outside the maze")
+        i = y * self.width + x
+        byte: int = self.grid[i >> 1]
+        return byte & 0xF if i & 1 else byte >> 4
+
+    def path(self) -> list[Direction]:
+        return unpack_path(self._path, self.steps)
+
+    def to_maze(self) -> Maze:
+        return Maze(
+            self.width, self.height,
+            cells=unpack_cells(self.grid, self.width * self.height),
+        )
+
+    def close(self) -> None:
+        self.grid.release()
+        self._path.release()
+        self._mm.close()
+
+    def __enter__(self) -> PackedMaze:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def load_packed(filename: str) -> PackedMaze:
+    return PackedMaze(filename)